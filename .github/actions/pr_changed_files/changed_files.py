@@ -0,0 +1,131 @@
+"""
+
+Changed files of a pull request, from the local git history
+
+Lists the files added, copied, modified or renamed between two revisions with
+`git diff --name-status base...head`, keeps the ones matching the patterns given
+to the action and derives the recipe folders they belong to. Patterns are matched
+one path component at a time with `fnmatch`, a pattern only matches paths with the
+same number of components: `recipes/*/*/conanfile.py` does not match a test package.
+
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import subprocess
+from pathlib import PurePosixPath
+
+
+class PatternTree:
+    """
+       Patterns compiled into a tree keyed by path component, shared prefixes are only matched once
+    """
+
+    def __init__(self, patterns):
+        self.root = {}
+        self.empty = True
+        for pattern in patterns:
+            parts = PurePosixPath(pattern.strip()).parts
+            if not parts:
+                continue
+            node = self.root
+            for part in parts:
+                node = node.setdefault(part, {})
+            node[None] = True  # a pattern ends here
+            self.empty = False
+
+    def match(self, path):
+        """ Whether a path matches any pattern, an empty tree matches everything """
+        return self.empty or self._match(self.root, PurePosixPath(path).parts)
+
+    def _match(self, node, parts):
+        if not parts:
+            return None in node
+        part, rest = parts[0], parts[1:]
+        literal = node.get(part)
+        if literal is not None and self._match(literal, rest):
+            return True
+        return any(self._match(child, rest) for key, child in node.items()
+                   if key is not None and key != part and fnmatch.fnmatch(part, key))
+
+
+def git_changed_files(base, head, cwd=None):
+    """ Files added, copied, modified, renamed or with a changed type between the merge base of two revisions and head """
+    res = subprocess.run(["git", "diff", "--name-status", "-z", f"{base}...{head}"], capture_output=True, check=True,
+                         cwd=cwd)
+    fields = res.stdout.decode("utf-8").split("\0")
+    files = []
+    i = 0
+    while i < len(fields) - 1:
+        status = fields[i]
+        if status[:1] in ("R", "C"):
+            # Renames and copies list the source then the destination
+            path = fields[i + 2]
+            i += 3
+        else:
+            path = fields[i + 1]
+            i += 2
+        if status[:1] != "D":
+            files.append(path)
+    return files
+
+
+def recipe_folders(files, root="."):
+    """ Recipe folders (`recipes/<name>/<folder>`) containing changed files, all of them when `config.yml` changed """
+    folders = set()
+    for path in files:
+        parts = PurePosixPath(path).parts
+        if len(parts) < 3 or parts[0] != "recipes":
+            continue
+        if len(parts) > 3:
+            folders.add("/".join(parts[:3]))
+        else:
+            recipe_dir = os.path.join(root, "recipes", parts[1])
+            if os.path.isdir(recipe_dir):
+                folders.update(f"recipes/{parts[1]}/{d}" for d in os.listdir(recipe_dir)
+                               if os.path.isdir(os.path.join(recipe_dir, d)))
+    return sorted(folders)
+
+
+def changed_files(base, head, patterns, cwd=None):
+    """ {"all_changed_files", "any_changed", "recipe_folders"} as output by the action """
+    tree = PatternTree(patterns)
+    files = [f for f in git_changed_files(base, head, cwd=cwd) if tree.match(f)]
+    return {
+        "all_changed_files": files,
+        "any_changed": bool(files),
+        "recipe_folders": recipe_folders(files, root=cwd or "."),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List the files changed between two revisions which match some patterns."
+    )
+    parser.add_argument("--base", required=True, help="revision the changes are compared to, e.g. the base branch.")
+    parser.add_argument("--head", default="HEAD", help="revision with the changes.")
+    parser.add_argument("--files", action="append", default=[],
+                        help="patterns of the files to consider, one per line, can be repeated "
+                             "(default: every file).")
+    parser.add_argument("--format", choices=["text", "json", "github-output"], default="text",
+                        help="`github-output` appends the outputs of the action to $GITHUB_OUTPUT.")
+    args = parser.parse_args()
+
+    patterns = [line for value in args.files for line in value.splitlines()]
+    result = changed_files(args.base, args.head, patterns)
+    if args.format == "json":
+        print(json.dumps(result, indent=4))
+    elif args.format == "github-output":
+        with open(os.environ["GITHUB_OUTPUT"], "a", encoding="utf-8") as output_file:
+            output_file.write(f"any_changed={'true' if result['any_changed'] else 'false'}\n")
+            output_file.write(f"all_changed_files={' '.join(result['all_changed_files'])}\n")
+            output_file.write(f"recipe_folders={' '.join(result['recipe_folders'])}\n")
+    else:
+        for path in result["all_changed_files"]:
+            print(path)
+
+
+if __name__ == "__main__":
+    main()
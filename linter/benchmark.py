@@ -0,0 +1,309 @@
+"""
+
+Performance benchmark of the linters
+
+Lints a pinned corpus of recipes (`benchmark_corpus.txt`) once per scenario: pylint alone,
+each checker of `conanv2_transition.py` and each astroid transform alone, all the plugins
+together as configured by the rcfiles, and each YAML linter. Every scenario runs in its own
+process, its CPU time and peak RSS are taken from the kernel, and the fastest of several
+repetitions is kept. The result is a JSON baseline which a later run can be compared to,
+failing when a scenario became slower than the allowed regression.
+
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+
+
+LINTER_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(LINTER_DIR)
+DEFAULT_CORPUS = os.path.join(LINTER_DIR, "benchmark_corpus.txt")
+
+TRANSFORMS = ["transform_conanfile", "transform_imports"]
+
+# Checkers selected by the worker process, see `register`
+_SELECTED_CHECKERS = set()
+
+
+class _CheckerFilter:
+    """
+       Stands for the linter given to `conanv2_transition.register`, only lets the selected checkers through
+    """
+
+    def __init__(self, linter):
+        self.linter = linter
+        self.checkers = []
+
+    def __getattr__(self, name):
+        return getattr(self.linter, name)
+
+    def register_checker(self, checker):
+        self.checkers.append(checker)
+        if checker.name in _SELECTED_CHECKERS:
+            self.linter.register_checker(checker)
+
+
+def register(linter):
+    """ Pylint plugin entry point of the worker process (loaded as `__main__`) """
+    from linter import conanv2_transition
+    conanv2_transition.register(_CheckerFilter(linter))
+
+
+def list_checkers():
+    """ [(checker name, [message symbols])] registered by `conanv2_transition.py` """
+    from pylint.lint import PyLinter
+    from linter import conanv2_transition
+    checker_filter = _CheckerFilter(PyLinter())
+    conanv2_transition.register(checker_filter)
+    return [(c.name, sorted(m[1] for m in c.msgs.values())) for c in checker_filter.checkers]
+
+
+def worker(argv):
+    """ Run pylint in this process with the checkers selected by `--checker` options """
+    from pylint.lint import Run
+    args = []
+    for arg in argv:
+        if arg.startswith("--checker="):
+            _SELECTED_CHECKERS.add(arg.split("=", 1)[1])
+        else:
+            args.append(arg)
+    if _SELECTED_CHECKERS:
+        args.insert(0, "--load-plugins=__main__")
+    Run(args, exit=False)
+
+
+def corpus_files(corpus):
+    """ {"recipe", "test_package", "conandata", "config": [files]} for the folders listed in the corpus file """
+    with open(corpus, encoding="utf-8") as f:
+        folders = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    files = {"recipe": [], "test_package": [], "conandata": [], "config": []}
+    for folder in folders:
+        path = os.path.join(ROOT_DIR, folder)
+        files["recipe"].append(os.path.join(path, "conanfile.py"))
+        files["test_package"].extend(sorted(glob.glob(os.path.join(path, "test_*", "conanfile.py"))))
+        files["conandata"].append(os.path.join(path, "conandata.yml"))
+        files["config"].append(os.path.join(os.path.dirname(path), "config.yml"))
+    missing = [f for group in files.values() for f in group if not os.path.isfile(f)]
+    if missing:
+        raise SystemExit(f"Missing files in the benchmark corpus: {', '.join(missing)}")
+    return files
+
+
+def corpus_fingerprint(files):
+    sha = hashlib.sha256()
+    for path in sorted(f for group in files.values() for f in group):
+        sha.update(os.path.relpath(path, ROOT_DIR).replace(os.sep, "/").encode())
+        with open(path, "rb") as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def scenarios(root, files):
+    """ {name: [commands]}, the commands of a scenario are run one after the other """
+    linter_dir = os.path.join(root, "linter")
+    pylint = [sys.executable, os.path.abspath(__file__), "_worker", "--exit-zero", "--jobs=1",
+              "--output-format=text", "--reports=no", "--score=no"]
+    python_files = files["recipe"] + files["test_package"]
+    bare = pylint + [f"--rcfile={os.devnull}", "--disable=all"]
+    defaults = pylint + [f"--rcfile={os.devnull}", "--disable=fixme,line-too-long,duplicate-code"]
+
+    result = {
+        "pylint/parse": [bare + python_files],
+        "pylint/defaults": [defaults + python_files],
+    }
+    for name, symbols in _run_list_checkers(root):
+        result[f"checker/{name}"] = [bare + [f"--checker={name}", f"--enable={','.join(symbols)}"] + python_files]
+    for transform in TRANSFORMS:
+        result[f"transform/{transform}"] = [defaults + [f"--load-plugins=linter.{transform}"] + python_files]
+    result["pylint/all"] = [
+        pylint + [f"--rcfile={os.path.join(linter_dir, 'pylintrc_recipe')}"] + files["recipe"],
+        pylint + [f"--rcfile={os.path.join(linter_dir, 'pylintrc_testpackage')}"] + files["test_package"],
+    ]
+    yaml_linters = {
+        "yaml/conandata": ("conandata_yaml_linter.py", files["conandata"]),
+        "yaml/config": ("config_yaml_linter.py", files["config"]),
+        "yaml/patches": ("conandata_patches_linter.py", files["conandata"]),
+    }
+    for name, (script, yaml_files) in yaml_linters.items():
+        path = os.path.join(linter_dir, script)
+        if os.path.isfile(path):
+            extra = ["--no-cache"] if script == "conandata_patches_linter.py" else []
+            result[name] = [[sys.executable, path, "--jobs=1", *extra, *yaml_files]]
+    return result
+
+
+def _env(root):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    return env
+
+
+def _run_list_checkers(root):
+    res = subprocess.run([sys.executable, os.path.abspath(__file__), "_list"], capture_output=True, text=True,
+                         env=_env(root), check=True)
+    return json.loads(res.stdout)
+
+
+def measure(command, root):
+    """ (wall time, CPU time, peak RSS in KiB) of a command """
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr, env=_env(root), cwd=root)
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+        process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        if process.returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"{' '.join(command[:4])}... failed: {stderr.read().decode(errors='replace').strip()}")
+    return wall, usage.ru_utime + usage.ru_stime, usage.ru_maxrss
+
+
+def run_scenario(commands, root, repeat):
+    """ Fastest CPU time of the repetitions, with its wall time, and the peak RSS of all of them """
+    best = None
+    max_rss = 0
+    for _ in range(repeat):
+        wall = cpu = 0.0
+        for command in commands:
+            command_wall, command_cpu, rss = measure(command, root)
+            wall += command_wall
+            cpu += command_cpu
+            max_rss = max(max_rss, rss)
+        if best is None or cpu < best[1]:
+            best = (wall, cpu)
+    return {"wall": round(best[0], 3), "cpu": round(best[1], 3), "max_rss_kib": max_rss}
+
+
+def _version(distribution):
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def run_command(args):
+    root = os.path.abspath(args.root)
+    files = corpus_files(args.corpus)
+    selected = {name: commands for name, commands in scenarios(root, files).items()
+                if not args.scenario or any(fnmatch.fnmatch(name, p) for p in args.scenario)}
+
+    results = {}
+    for name, commands in selected.items():
+        try:
+            results[name] = run_scenario(commands, root, args.repeat)
+        except RuntimeError as error:
+            # e.g. a linter of the base branch which does not support the arguments yet
+            print(f"{name:<50} skipped, {error}", file=sys.stderr)
+            continue
+        print(f"{name:<50} {results[name]['cpu']:8.2f}s CPU {results[name]['wall']:8.2f}s wall "
+              f"{results[name]['max_rss_kib'] / 1024:8.1f} MiB", file=sys.stderr)
+    # The cost of a checker or transform is what it adds to the pylint run it is plugged into
+    for name, result in results.items():
+        reference = "pylint/defaults" if name.startswith("transform/") else "pylint/parse"
+        if name.split("/")[0] in ("checker", "transform") and reference in results:
+            result["added_cpu"] = round(result["cpu"] - results[reference]["cpu"], 3)
+
+    report = {
+        "corpus": corpus_fingerprint(files),
+        "files": sum(len(group) for group in files.values()),
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "pylint": _version("pylint"),
+        "astroid": _version("astroid"),
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, sort_keys=True)
+    else:
+        print(json.dumps(report, indent=4, sort_keys=True))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            return compare(json.load(f), report, args.max_regression, args.min_seconds)
+    return 0
+
+
+def compare(baseline, current, max_regression, min_seconds):
+    """ Print the evolution of every scenario, return 1 if one of them regressed more than allowed """
+    if baseline.get("corpus") != current.get("corpus"):
+        print("Warning: the baseline was measured on a different corpus", file=sys.stderr)
+    regressions = []
+    for name, result in sorted(current["scenarios"].items()):
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<50} {result['cpu']:8.2f}s CPU (new)")
+            continue
+        change = (result["cpu"] - before["cpu"]) / before["cpu"] * 100 if before["cpu"] else 0.0
+        rss_change = (result["max_rss_kib"] - before["max_rss_kib"]) / 1024
+        regressed = change > max_regression and result["cpu"] - before["cpu"] > min_seconds
+        print(f"{name:<50} {before['cpu']:8.2f}s -> {result['cpu']:8.2f}s CPU ({change:+6.1f}%), "
+              f"peak RSS {rss_change:+.1f} MiB{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    if regressions:
+        print(f"{len(regressions)} scenarios are more than {max_regression}% slower: {', '.join(regressions)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+def compare_command(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    return compare(baseline, current, args.max_regression, args.min_seconds)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "_worker":
+        worker(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "_list":
+        print(json.dumps(list_checkers()))
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Measure the time and memory used by each linter over a pinned corpus of recipes."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmark.")
+    run_parser.add_argument("scenario", nargs="*",
+                            help="fnmatch patterns of the scenarios to run, like `checker/*` (default: all).")
+    run_parser.add_argument("--root", default=ROOT_DIR,
+                            help="repository whose linters are benchmarked, e.g. a checkout of the base branch "
+                                 "(the corpus is always read from this repository).")
+    run_parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="file listing the recipe folders to lint.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="repetitions of each scenario, the fastest is kept.")
+    run_parser.add_argument("--output", help="write the JSON results to this file instead of stdout.")
+    run_parser.add_argument("--baseline", help="JSON results of a previous run to compare to.")
+    run_parser.set_defaults(func=run_command)
+
+    compare_parser = subparsers.add_parser("compare", help="compare the JSON results of two runs.")
+    compare_parser.add_argument("baseline", help="JSON results of the reference run.")
+    compare_parser.add_argument("current", help="JSON results of the new run.")
+    compare_parser.set_defaults(func=compare_command)
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument("--max-regression", type=float, default=10.0,
+                               help="fail when a scenario takes more than this percentage of extra CPU time.")
+        subparser.add_argument("--min-seconds", type=float, default=0.5,
+                               help="ignore regressions smaller than this number of seconds, which are noise.")
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+
+Bulk verification of the patches listed in conandata.yml
+
+Checks that every `patch_file` exists, that it is a well formed unified diff (file
+headers, hunk line counts) and reports the patch files no version uses anymore.
+The result of each patch is cached by its sha256, so only new or modified patches
+are parsed again and the whole index can be checked in one CI step.
+
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+from yaml_linting import add_batch_arguments
+
+
+CONANDATA_YAML_URL = "https://github.com/conan-io/conan-center-index/blob/master/docs/adding_packages/conandata_yml_format.md"
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".linter_cache", "patches.json")
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+PATCH_EXTENSIONS = (".patch", ".diff")
+
+_YAML_LOADER = getattr(yaml, "CBaseLoader", yaml.BaseLoader)
+
+
+def checker_fingerprint():
+    """ Cached results are only valid for this version of the checker """
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def check_patch(content):
+    """ Problems found in the unified diff headers and hunks of a patch, as (line, message) """
+    lines = content.decode("utf-8", errors="replace").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    problems = []
+    files = hunks = 0
+    has_header = False
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip("\r")
+        if line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            has_header = True
+            files += 1
+            i += 2
+            continue
+        match = HUNK_HEADER.match(line)
+        if not match:
+            i += 1
+            continue
+        if not has_header:
+            problems.append((i + 1, "hunk without a `---`/`+++` file header"))
+        hunks += 1
+        old = 1 if match.group(2) is None else int(match.group(2))
+        new = 1 if match.group(4) is None else int(match.group(4))
+        start = i + 1
+        i += 1
+        while (old > 0 or new > 0) and i < len(lines):
+            hunk_line = lines[i].rstrip("\r")
+            if hunk_line.startswith("\\"):
+                pass  # "\ No newline at end of file"
+            elif hunk_line.startswith("-"):
+                old -= 1
+            elif hunk_line.startswith("+"):
+                new -= 1
+            elif hunk_line.startswith(" ") or hunk_line == "":
+                # Empty lines are context lines whose trailing space was stripped, which patch tools accept
+                old -= 1
+                new -= 1
+            else:
+                break
+            i += 1
+        if old != 0 or new != 0:
+            problems.append((start, f"hunk `{line}` does not match its line counts "
+                                    f"({old} removed and {new} added lines are missing or in excess)"))
+    if not hunks and not any(line.startswith("diff --git ") for line in lines):
+        problems.append((1, "no hunk found, this is not a unified diff"))
+    elif hunks and not files:
+        problems.append((1, "no `---`/`+++` file header found"))
+    return problems
+
+
+def _check_patch_file(path):
+    with open(path, "rb") as f:
+        return check_patch(f.read())
+
+
+def load_cache(cache_path, fingerprint):
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("results", {}) if cache.get("fingerprint") == fingerprint else {}
+
+
+def save_cache(cache_path, fingerprint, results):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "results": results}, f)
+
+
+def referenced_patches(conandata_path):
+    """ {patch path: first line of conandata.yml referencing it} and the annotations for the missing ones """
+    with open(conandata_path, encoding="utf-8") as f:
+        content = f.read()
+    patches = (yaml.load(content, Loader=_YAML_LOADER) or {}).get("patches") or {}
+    folder = os.path.dirname(conandata_path)
+    referenced, report = {}, []
+    for version, version_patches in patches.items():
+        for patch in version_patches if isinstance(version_patches, list) else []:
+            patch_file = patch.get("patch_file") if isinstance(patch, dict) else None
+            if not isinstance(patch_file, str):
+                continue  # reported by conandata_yaml_linter.py
+            path = os.path.normpath(os.path.join(folder, patch_file))
+            line = _line_of(content, patch_file)
+            if not os.path.isfile(path):
+                report.append(
+                    f"::error file={conandata_path},line={line},title=conandata.yml missing patch"
+                    f"::Patch file `{patch_file}` listed for version `{version}` does not exist."
+                )
+            else:
+                referenced.setdefault(path, line)
+    return referenced, report
+
+
+def _line_of(content, text):
+    position = content.find(text)
+    return content.count("\n", 0, position) + 1 if position >= 0 else 1
+
+
+def unreferenced_patches(conandata_path, referenced):
+    folder = os.path.dirname(conandata_path)
+    found = glob.glob(os.path.join(folder, "patches", "**", "*"), recursive=True)
+    return sorted(os.path.normpath(p) for p in found
+                  if p.endswith(PATCH_EXTENSIONS) and os.path.normpath(p) not in referenced)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Verify the patches listed in Conan's 'conandata.yml' files: existence, unified diff format and "
+                    "unreferenced patch files."
+    )
+    add_batch_arguments(parser, "conandata.yml")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="JSON file caching the results of each patch.")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the cache.")
+    args = parser.parse_args()
+
+    report = []
+    patch_files = set()
+    for conandata_path in sorted({f for files in args.path for f in files}):
+        try:
+            referenced, missing = referenced_patches(conandata_path)
+        except (yaml.YAMLError, AttributeError):
+            continue  # reported by conandata_yaml_linter.py
+        report.extend(missing)
+        patch_files.update(referenced)
+        for path in unreferenced_patches(conandata_path, referenced):
+            report.append(
+                f"::warning file={path},line=1,title=unused patch"
+                f"::Patch file is not referenced by any version in the `patches` section of {conandata_path}"
+                f" (see {CONANDATA_YAML_URL}#patches), it should be removed."
+            )
+
+    fingerprint = checker_fingerprint()
+    cache = {} if args.no_cache else load_cache(args.cache, fingerprint)
+    hashes = {}
+    for path in sorted(patch_files):
+        with open(path, "rb") as f:
+            hashes[path] = hashlib.sha256(f.read()).hexdigest()
+    pending = sorted(p for p in patch_files if hashes[p] not in cache)
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            for path, problems in zip(pending, executor.map(_check_patch_file, pending, chunksize=16)):
+                cache[hashes[path]] = problems
+
+    for path in sorted(patch_files):
+        for line, message in cache[hashes[path]]:
+            report.append(f"::error file={path},line={line},title=malformed patch::{message}")
+
+    if not args.no_cache:
+        save_cache(args.cache, fingerprint, cache)
+    for line in report:
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+
+Benchmark of the libyaml fast path of `conandata_yaml_linter.py`
+
+Validates every conandata.yml with and without the fast path, reports the time taken
+by each mode and fails if their annotations are not byte-identical.
+
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+from conandata_yaml_linter import lint_file
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(files, fast_path):
+    start = time.perf_counter()
+    output = "".join(f"{line}\n" for path in files for line in lint_file(path, fast_path=fast_path))
+    return output, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the strictyaml only and the libyaml fast path validations of conandata.yml files."
+    )
+    parser.add_argument(
+        "pattern",
+        nargs="?",
+        default=os.path.join(os.path.relpath(ROOT_DIR), "recipes", "*", "*", "conandata.yml"),
+        help="glob pattern of the files to validate (default: the whole index).",
+    )
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(args.pattern))
+    if not files:
+        print(f"No file matches {args.pattern}, nothing to benchmark")
+        return
+    reference, reference_time = run(files, fast_path=False)
+    output, fast_time = run(files, fast_path=True)
+
+    print(f"{len(files)} files")
+    print(f"strictyaml only: {reference_time:.2f}s")
+    print(f"fast path:       {fast_time:.2f}s ({reference_time / fast_time:.1f}x faster)")
+    if output != reference:
+        print("Output differs between both modes", file=sys.stderr)
+        sys.exit(1)
+    print(f"Output is identical ({len(output.encode())} bytes)")
+
+
+if __name__ == "__main__":
+    main()
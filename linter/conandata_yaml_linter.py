@@ -1,4 +1,6 @@
 import argparse
+import functools
+import yaml
 from strictyaml import (
     load,
     Map,
@@ -10,61 +12,73 @@ from strictyaml import (
     Enum,
     Any,
 )
-from yaml_linting import file_path
+from yaml_linting import add_batch_arguments, run_batch
 
 
 CONANDATA_YAML_URL = "https://github.com/conan-io/conan-center-index/blob/master/docs/adding_packages/conandata_yml_format.md"
 
 
+PATCH_FIELDS = Map(
+    {
+        "patch_file": Str(),
+        "patch_description": Str(),
+        "patch_type": Enum(
+            ["official", "conan", "portability", "bugfix", "vulnerability"]
+        ),
+        Optional("patch_source"): Str(),
+        # No longer required for v2 recipes with layouts
+        Optional("base_path"): Str(),
+    }
+)
+SCHEMA = Map(
+    {
+        "sources": MapPattern(Str(), Any(), minimum_keys=1),
+        Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
+    }
+)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate Conan's 'conandata.yaml' file to ConanCenterIndex's requirements."
     )
+    add_batch_arguments(parser, "conandata.yml")
     parser.add_argument(
-        "path",
-        nargs="?",
-        type=file_path,
-        help="file to validate.",
+        "--no-fast-path",
+        dest="fast_path",
+        action="store_false",
+        help="always validate with strictyaml, even files which pass the libyaml pre-check.",
     )
     args = parser.parse_args()
+    run_batch(functools.partial(lint_file, fast_path=args.fast_path), args)
 
-    patch_fields = Map(
-        {
-            "patch_file": Str(),
-            "patch_description": Str(),
-            "patch_type": Enum(
-                ["official", "conan", "portability", "bugfix", "vulnerability"]
-            ),
-            Optional("patch_source"): Str(),
-            # No longer required for v2 recipes with layouts
-            Optional("base_path"): Str(),
-        }
-    )
-    schema = Map(
-        {
-            "sources": MapPattern(Str(), Any(), minimum_keys=1),
-            Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
-        }
-    )
 
-    with open(args.path, encoding="utf-8") as f:
+def lint_file(path, fast_path=True):
+    """ Validate a single file, return the GitHub annotations to print """
+    report = []
+    with open(path, encoding="utf-8") as f:
         content = f.read()
 
+    # strictyaml keeps line information for every node, which is only needed to report
+    # problems. Files without any are recognized with libyaml first.
+    if fast_path and is_clean(content):
+        return report
+
     try:
-        parsed = load(content, schema)
+        parsed = load(content, SCHEMA)
     except YAMLValidationError as error:
-        pretty_print_yaml_validate_error(args, error) # Error when "source" is missing or when "patches" has no versions
-        return
+        report.append(format_yaml_validate_error(path, error)) # Error when "source" is missing or when "patches" has no versions
+        return report
     except BaseException as error:
-        pretty_print_yaml_validate_error(args, error) # YAML could not be parsed
-        return
+        report.append(format_yaml_validate_error(path, error)) # YAML could not be parsed
+        return report
 
     if "patches" in parsed:
         for version in parsed["patches"]:
             patches = parsed["patches"][version]
             if version not in parsed["sources"]:
-                print(
-                    f"::warning file={args.path},line={patches.start_line},endline={patches.end_line},"
+                report.append(
+                    f"::warning file={path},line={patches.start_line},endline={patches.end_line},"
                     f"title=conandata.yml inconsistency"
                     f"::Patch(es) are listed for version `{version}`, but there is source for this version."
                     f" You should either remove `{version}` from the `patches` section, or add it to the"
@@ -73,9 +87,9 @@ def main():
             for i, patch in enumerate(patches):
                 # Individual report errors for each patch object
                 try:
-                    parsed["patches"][version][i].revalidate(patch_fields)
+                    parsed["patches"][version][i].revalidate(PATCH_FIELDS)
                 except YAMLValidationError as error:
-                    pretty_print_yaml_validate_warning(args, error) # Warning when patch fields are not followed
+                    report.append(format_yaml_validate_warning(path, error)) # Warning when patch fields are not followed
                     continue
 
                 # Make sure `patch_source` exists where it's encouraged
@@ -84,8 +98,8 @@ def main():
                     type in ["official", "bugfix", "vulnerability"]
                     and not "patch_source" in patch
                 ):
-                    print(
-                        f"::warning file={args.path},line={type.start_line},endline={type.end_line},"
+                    report.append(
+                        f"::warning file={path},line={type.start_line},endline={type.end_line},"
                         f"title=conandata.yml schema warning"
                         f"::'patch_type' should have 'patch_source' as per {CONANDATA_YAML_URL}#patch_type"
                         " it is expected to have a source (e.g. a URL) to where it originates from to help with"
@@ -95,27 +109,115 @@ def main():
                 # v2 migrations suggestion
                 if "base_path" in parsed["patches"][version][i]:
                     base_path = parsed["patches"][version][i]["base_path"]
-                    print(
-                        f"::notice file={args.path},line={base_path.start_line},endline={base_path.end_line},"
+                    report.append(
+                        f"::notice file={path},line={base_path.start_line},endline={base_path.end_line},"
                         f"title=conandata.yml v2 migration suggestion"
                         "::'base_path' should not be required once a recipe has been upgraded to take advantage of"
                         " layouts (see https://docs.conan.io/en/latest/reference/conanfile/tools/layout.html) and"
                         " the new helper (see https://docs.conan.io/en/latest/reference/conanfile/tools/files/patches.html#conan-tools-files-apply-conandata-patches)"
                     )
+    return report
+
+
+class _NotClean(Exception):
+    pass
+
+
+# Only the parser is used: scalars are kept as strings, like strictyaml does
+_FAST_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_PATCH_REQUIRED = {"patch_file", "patch_description", "patch_type"}
+_PATCH_OPTIONAL = {"patch_source", "base_path"}
+_PATCH_TYPES = {"official", "conan", "portability", "bugfix", "vulnerability"}
+
+
+def _compose(event, events):
+    """ Build a tree of str/list/dict from the parser events, for the subset of YAML strictyaml accepts """
+    if isinstance(event, yaml.AliasEvent) or event.anchor is not None or event.tag is not None:
+        raise _NotClean()
+    if isinstance(event, yaml.ScalarEvent):
+        if not event.value and event.style is None:
+            raise _NotClean()  # empty value
+        return event.value
+    if getattr(event, "flow_style", False):
+        raise _NotClean()
+    if isinstance(event, yaml.SequenceStartEvent):
+        items = []
+        for item in events:
+            if isinstance(item, yaml.SequenceEndEvent):
+                return items
+            items.append(_compose(item, events))
+    if isinstance(event, yaml.MappingStartEvent):
+        mapping = {}
+        for key in events:
+            if isinstance(key, yaml.MappingEndEvent):
+                return mapping
+            key = _compose(key, events)
+            if not isinstance(key, str) or key in mapping:
+                raise _NotClean()
+            mapping[key] = _compose(next(events), events)
+    raise _NotClean()
+
+
+def _load_fast(content):
+    events = yaml.parse(content, Loader=_FAST_LOADER)
+    if not isinstance(next(events), yaml.StreamStartEvent):
+        raise _NotClean()
+    document = next(events)
+    if not isinstance(document, yaml.DocumentStartEvent) or document.explicit or document.version or document.tags:
+        raise _NotClean()
+    data = _compose(next(events), events)
+    if not isinstance(next(events), yaml.DocumentEndEvent) or not isinstance(next(events), yaml.StreamEndEvent):
+        raise _NotClean()
+    return data
+
+
+def is_clean(content):
+    """ Whether strictyaml would validate this content without any error, warning or notice
+
+    This is a conservative check: any construction which is not plain block style YAML
+    following the schema is left to strictyaml.
+    """
+    try:
+        data = _load_fast(content)
+    except (_NotClean, yaml.YAMLError, StopIteration):
+        return False
+    if not isinstance(data, dict) or not set(data) <= {"sources", "patches"}:
+        return False
+    sources = data.get("sources")
+    if not isinstance(sources, dict) or not sources:
+        return False
+    if "patches" not in data:
+        return True
+    patches = data["patches"]
+    if not isinstance(patches, dict) or not patches:
+        return False
+    for version, version_patches in patches.items():
+        if version not in sources or not isinstance(version_patches, list):
+            return False
+        for patch in version_patches:
+            if not isinstance(patch, dict) or not _PATCH_REQUIRED <= set(patch) <= _PATCH_REQUIRED | _PATCH_OPTIONAL:
+                return False
+            if not all(isinstance(value, str) for value in patch.values()):
+                return False
+            if patch["patch_type"] not in _PATCH_TYPES or "base_path" in patch:
+                return False
+            if patch["patch_type"] in ["official", "bugfix", "vulnerability"] and "patch_source" not in patch:
+                return False
+    return True
 
 
-def pretty_print_yaml_validate_error(args, error):
+def format_yaml_validate_error(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::error file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema error"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
     
-def pretty_print_yaml_validate_warning(args, error):
+def format_yaml_validate_warning(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::warning file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::warning file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema warning"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
@@ -0,0 +1,241 @@
+"""
+
+Fast mode for the Conan v2 migration checkers
+
+Runs the same rules as the pylint plugins registered in `conanv2_transition.py`, with
+the same message IDs, using a single `ast.NodeVisitor` pass per file. It does not need
+pylint, astroid nor Conan, so the whole index can be checked in a few seconds.
+
+"""
+
+import argparse
+import ast
+import configparser
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from lint_index import collect_files
+
+
+LINTER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Same message IDs, symbols and texts as the pylint checkers
+MESSAGES = {
+    "E9004": ("conan-bad-name", "Reference name should be all lowercase"),
+    "E9005": ("conan-missing-name", "Missing name attribute"),
+    "E9006": ("conan-import-conanfile",
+              "Import ConanFile from new module: `from conan import ConanFile`. Old import is deprecated in Conan v2."),
+    "E9007": ("conan-test-no-name", "No 'name' attribute in test_package conanfile"),
+    "E9008": ("conan-import-errors",
+              "Import errors from new module: `from conan import errors`. Old import is deprecated in Conan v2."),
+    "E9009": ("conan-import-error-conanexception",
+              "Import ConanException from new module: `from conan.errors import ConanException`. Old import is deprecated in Conan v2."),
+    "E9010": ("conan-import-error-conaninvalidconfiguration",
+              "Import ConanInvalidConfiguration from new module: `from conan.errors import ConanInvalidConfiguration`. Old import is deprecated in Conan v2."),
+    "E9011": ("conan-import-tools",
+              "Import tools following pattern 'from conan.tools.xxxx import yyyyy' (https://docs.conan.io/en/latest/reference/conanfile/tools.html)."),
+    "E9012": ("conan-missing-layout-src-folder", "layout is missing `src_folder` argument which should be to `src`"),
+    "E9013": ("conan-layout-src-folder-is-src", "layout should set `src_folder` to `src`"),
+    "E9014": ("conan-forced-version", "Recipe should not contain version attribute"),
+}
+SYMBOLS = {symbol: msg_id for msg_id, (symbol, _) in MESSAGES.items()}
+
+
+def is_test_package(filename):
+    path = Path(filename)
+    return path.match('test_package/*.py') or path.match('test_v1_package/*.py')
+
+
+def disabled_messages(rcfile):
+    """ Conan messages disabled in a pylint rcfile """
+    config = configparser.ConfigParser(inline_comment_prefixes=("#",))
+    config.read(rcfile)
+    disabled = config.get("MESSAGES CONTROL", "disable", fallback="")
+    names = {name.strip() for name in disabled.replace("\n", ",").split(",")}
+    return {SYMBOLS.get(name, name) for name in names if name} & set(MESSAGES)
+
+
+RECIPE_DISABLED = disabled_messages(os.path.join(LINTER_DIR, "pylintrc_recipe"))
+TEST_PACKAGE_DISABLED = disabled_messages(os.path.join(LINTER_DIR, "pylintrc_testpackage"))
+
+
+def _dotted_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted_name(node.value)}.{node.attr}"
+    return None
+
+
+class ConanV2Visitor(ast.NodeVisitor):
+    """
+       Single pass over a conanfile, equivalent to the checkers in `conanv2_transition.py`
+    """
+
+    def __init__(self, filename, source):
+        self.filename = filename
+        self.source = source
+        self.is_test = is_test_package(filename)
+        self.scope = []
+        self.messages = []
+
+    def add_message(self, msg_id, node):
+        self.messages.append((node.lineno, node.col_offset, msg_id, ".".join(self.scope)))
+
+    def _as_string(self, node):
+        if isinstance(node, ast.Constant):
+            return repr(node.value)
+        return ast.get_source_segment(self.source, node) or ""
+
+    def _class_constant(self, node, attr_name):
+        """ First `<attr_name> = <constant>` statement in the class body, as pylint sees it """
+        for attr in node.body:
+            if isinstance(attr, ast.Assign):
+                if len(attr.targets) != 1:
+                    continue
+                target = attr.targets[0]
+            elif isinstance(attr, ast.AugAssign):
+                target = attr.target
+            else:
+                continue
+            if isinstance(target, ast.Name) and target.id == attr_name and isinstance(attr.value, ast.Constant):
+                return attr
+        return None
+
+    def visit_ClassDef(self, node):
+        self.scope.append(node.name)
+        if [_dotted_name(base) for base in node.bases] == ["ConanFile"]:
+            # PackageName
+            attr = self._class_constant(node, "name")
+            if attr is not None:
+                if self.is_test:
+                    self.add_message("E9007", attr)
+                else:
+                    value = self._as_string(attr.value)
+                    if value.lower() != value:
+                        self.add_message("E9004", attr)
+            elif not self.is_test:
+                self.add_message("E9005", node)
+            # VersionAttribute
+            attr = self._class_constant(node, "version")
+            if attr is not None:
+                value = self._as_string(attr.value).replace('"', "").replace("'", "")
+                if value and value != "system":
+                    self.add_message("E9014", attr)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node):
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ImportFrom(self, node):
+        basename = node.module or ""
+        names = [alias.name for alias in node.names]
+        if basename == "conans":
+            if "ConanFile" in names:
+                self.add_message("E9006", node)
+            if "errors" in names:
+                self.add_message("E9008", node)
+        elif basename == "conans.errors":
+            if "ConanException" in names:
+                self.add_message("E9009", node)
+            if "ConanInvalidConfiguration" in names:
+                self.add_message("E9010", node)
+        if basename == "conan" and "tools" in names:
+            self.add_message("E9011", node)
+        elif re.match(r'conan\.tools\.[^.]+\..+', basename):
+            self.add_message("E9011", node)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in ["cmake_layout", "bazel_layout", "basic_layout"]:
+            for kw in node.keywords:
+                if kw.arg == "src_folder":
+                    if self._as_string(kw.value).strip("\"'") != "src":
+                        self.add_message("E9013", node)
+                    break
+            else:
+                self.add_message("E9012", node)
+        self.generic_visit(node)
+
+
+def lint_file(filename, disabled):
+    with open(filename, encoding="utf-8") as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source, filename=filename)
+    except SyntaxError as error:
+        return [{"path": filename, "line": error.lineno or 1, "column": error.offset or 0, "obj": "",
+                 "message-id": "E0001", "symbol": "syntax-error", "message": f"{error.msg}", "type": "error"}]
+    visitor = ConanV2Visitor(filename, source)
+    visitor.visit(tree)
+    return [{"path": filename, "line": line, "column": column, "obj": obj,
+             "message-id": msg_id, "symbol": MESSAGES[msg_id][0], "message": MESSAGES[msg_id][1], "type": "error"}
+            for line, column, msg_id, obj in sorted(visitor.messages)
+            if msg_id not in disabled]
+
+
+def _lint_file_with_rcfile(filename):
+    disabled = TEST_PACKAGE_DISABLED if is_test_package(filename) else RECIPE_DISABLED
+    return lint_file(filename, disabled)
+
+
+def compare_with_pylint(messages, pylint_json):
+    """ Differences between these messages and the Conan messages of a pylint JSON report """
+    with open(pylint_json, encoding="utf-8") as f:
+        expected = {(os.path.normpath(m["path"]), m["line"], m["message-id"])
+                    for m in json.load(f) if m["message-id"] in MESSAGES}
+    found = {(os.path.normpath(m["path"]), m["line"], m["message-id"]) for m in messages
+             if m["message-id"] in MESSAGES}
+    return sorted(expected - found), sorted(found - expected)
+
+
+def format_parseable(msg):
+    return f"{msg['path']}:{msg['line']}: [{msg['message-id']}({msg['symbol']}), {msg['obj']}] {msg['message']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check conanfiles against the Conan v2 migration rules without running pylint."
+    )
+    parser.add_argument("paths", nargs="*",
+                        help="conanfile.py files or glob patterns (default: every recipe and test package).")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="number of worker processes.")
+    parser.add_argument("--output-format", choices=["json", "parseable"], default="parseable")
+    parser.add_argument("--parity", metavar="PYLINT_JSON",
+                        help="compare the result with a pylint JSON report (see lint_index.py) of the same files, "
+                             "and fail if the Conan messages differ.")
+    args = parser.parse_args()
+
+    files = collect_files(["recipe", "test_package"], args.paths)
+
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        messages = [m for result in executor.map(_lint_file_with_rcfile, files, chunksize=64) for m in result]
+
+    if args.parity:
+        missing, unexpected = compare_with_pylint(messages, args.parity)
+        for path, line, msg_id in missing:
+            print(f"{path}:{line}: {msg_id} reported by pylint but not by the fast linter")
+        for path, line, msg_id in unexpected:
+            print(f"{path}:{line}: {msg_id} reported by the fast linter but not by pylint")
+        print(f"Parity check over {len(files)} files: {len(missing)} missing, {len(unexpected)} unexpected",
+              file=sys.stderr)
+        sys.exit(1 if missing or unexpected else 0)
+
+    if args.output_format == "json":
+        print(json.dumps(messages, indent=4))
+    else:
+        for msg in messages:
+            print(format_parseable(msg))
+    sys.exit(1 if messages else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,37 @@
 import argparse
 from strictyaml import load, Map, Str, YAMLValidationError, MapPattern
-from yaml_linting import file_path
+from yaml_linting import add_batch_arguments, run_batch
+
+
+SCHEMA = Map(
+    {"versions": MapPattern(Str(), Map({"folder": Str()}), minimum_keys=1)}
+)
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Validate ConanCenterIndex's 'config.yaml' file."
     )
-    parser.add_argument(
-        "path",
-        nargs="?",
-        type=file_path,
-        help="file to validate.",
-    )
+    add_batch_arguments(parser, "config.yml")
     args = parser.parse_args()
+    run_batch(lint_file, args)
 
-    schema = Map(
-        {"versions": MapPattern(Str(), Map({"folder": Str()}), minimum_keys=1)}
-    )
 
-    with open(args.path) as f:
+def lint_file(path):
+    """ Validate a single file, return the GitHub annotations to print """
+    with open(path) as f:
         content = f.read()
 
     try:
-        load(content, schema)
+        load(content, SCHEMA)
     except YAMLValidationError as error:
         e = error.__str__().replace("\n", "%0A")
-        print(
-            f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line},"
+        return [
+            f"::error file={path},line={error.context_mark.line},endline={error.problem_mark.line},"
             f"title=config.yml schema error"
             f"::{e}\n"
-        )
+        ]
+    return []
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+"""
+
+Run the Conan v2 migration pylint plugins over the whole index
+
+Recipes and test packages are split in chunks which are linted by a pool of
+pylint processes. Results are cached per file, keyed on the file content and on
+a fingerprint of the linter plugins and rcfiles, so that an unchanged tree is
+re-linted in seconds and a plugin change re-lints everything.
+
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from importlib import metadata
+
+
+LINTER_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(LINTER_DIR)
+
+RCFILES = {
+    "recipe": os.path.join(LINTER_DIR, "pylintrc_recipe"),
+    "test_package": os.path.join(LINTER_DIR, "pylintrc_testpackage"),
+}
+PATTERNS = {
+    "recipe": ["recipes/*/*/conanfile.py"],
+    "test_package": ["recipes/*/*/test_package/conanfile.py", "recipes/*/*/test_v1_package/conanfile.py"],
+}
+
+# `duplicate-code` compares files against each other, its result depends on how files are
+# grouped in chunks, so it can not be cached per file.
+EXTRA_ARGS = ["--disable=duplicate-code"]
+
+
+def file_kind(path):
+    parent = os.path.basename(os.path.dirname(path))
+    return "test_package" if parent.startswith("test_") else "recipe"
+
+
+def collect_files(kinds, paths):
+    files = []
+    if paths:
+        for path in paths:
+            files.extend(sorted(glob.glob(path)) if glob.has_magic(path) else [path])
+    else:
+        for kind in kinds:
+            for pattern in PATTERNS[kind]:
+                files.extend(sorted(glob.glob(os.path.join(os.path.relpath(ROOT_DIR), pattern))))
+    return sorted({os.path.normpath(f) for f in files if file_kind(f) in kinds})
+
+
+def _tool_version(distribution):
+    try:
+        return metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def linter_fingerprint():
+    """ Hash of everything that can change the result of linting an unchanged file """
+    sha = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(LINTER_DIR, "*.py"))) + sorted(RCFILES.values()):
+        sha.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            sha.update(f.read())
+    for distribution in ("pylint", "astroid", "conan"):
+        sha.update(f"{distribution}={_tool_version(distribution)}".encode())
+    sha.update(" ".join(EXTRA_ARGS).encode())
+    return sha.hexdigest()
+
+
+def cache_key(fingerprint, path):
+    sha = hashlib.sha256(fingerprint.encode())
+    sha.update(path.replace(os.sep, "/").encode())
+    with open(path, "rb") as f:
+        sha.update(f.read())
+    return sha.hexdigest()
+
+
+def _cache_file(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], f"{key}.json")
+
+
+def load_cached(cache_dir, key):
+    try:
+        with open(_cache_file(cache_dir, key), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(cache_dir, key, messages):
+    filename = _cache_file(cache_dir, key)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(messages, f)
+    os.replace(tmp, filename)
+
+
+def run_pylint(kind, files):
+    """ Lint a chunk of files with a single pylint process, return messages grouped by file """
+    cmd = [sys.executable, "-m", "pylint", f"--rcfile={RCFILES[kind]}", "--output-format=json",
+           "--exit-zero", *EXTRA_ARGS, *files]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (ROOT_DIR, env.get("PYTHONPATH")) if p)
+    res = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    try:
+        messages = json.loads(res.stdout or "[]")
+    except ValueError:
+        raise RuntimeError(f"pylint failed on {files[0]}...: {res.stderr.strip()}") from None
+    result = {f: [] for f in files}
+    for msg in messages:
+        result.setdefault(os.path.normpath(msg["path"]), []).append(msg)
+    return result
+
+
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def format_parseable(msg):
+    return f"{msg['path']}:{msg['line']}: [{msg['message-id']}({msg['symbol']}), {msg['obj']}] {msg['message']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Lint ConanCenterIndex recipes with the Conan v2 migration pylint plugins, in parallel and cached."
+    )
+    parser.add_argument("paths", nargs="*",
+                        help="conanfile.py files or glob patterns (default: every recipe and test package).")
+    parser.add_argument("--kind", choices=["recipe", "test_package", "all"], default="all",
+                        help="which conanfiles to lint, selects the matching rcfile.")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="number of pylint processes to run in parallel.")
+    parser.add_argument("--chunk-size", type=int, default=25,
+                        help="number of files linted by each pylint process.")
+    parser.add_argument("--cache-dir", default=os.path.join(ROOT_DIR, ".linter_cache", "pylint"),
+                        help="directory where per-file results are cached.")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the cache.")
+    parser.add_argument("--output-format", choices=["json", "parseable"], default="json")
+    parser.add_argument("--output", help="write the report to this file instead of stdout.")
+    args = parser.parse_args()
+
+    kinds = ["recipe", "test_package"] if args.kind == "all" else [args.kind]
+    files = collect_files(kinds, args.paths)
+    start = time.time()
+
+    fingerprint = linter_fingerprint()
+    keys = {f: cache_key(fingerprint, f) for f in files}
+    results = {}
+    pending = {kind: [] for kind in kinds}
+    for f in files:
+        cached = None if args.no_cache else load_cached(args.cache_dir, keys[f])
+        if cached is None:
+            pending[file_kind(f)].append(f)
+        else:
+            results[f] = cached
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = [executor.submit(run_pylint, kind, chunk)
+                   for kind, kind_files in pending.items()
+                   for chunk in chunks(kind_files, args.chunk_size)]
+        for future in as_completed(futures):
+            try:
+                chunk_results = future.result()
+            except RuntimeError as error:
+                print(error, file=sys.stderr)
+                failed = True
+                continue
+            for f, messages in chunk_results.items():
+                results[f] = messages
+                if not args.no_cache and f in keys:
+                    store_cached(args.cache_dir, keys[f], messages)
+
+    messages = sorted((m for f in sorted(results) for m in results[f]),
+                      key=lambda m: (m["path"], m["line"], m["column"], m["message-id"]))
+    if args.output_format == "json":
+        report = json.dumps(messages, indent=4)
+    else:
+        report = "\n".join(format_parseable(m) for m in messages)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+    else:
+        print(report)
+
+    linted = sum(len(p) for p in pending.values())
+    print(f"Linted {len(files)} files ({len(files) - linted} cached, {linted} linted) in {time.time() - start:.1f}s",
+          file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
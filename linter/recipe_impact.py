@@ -0,0 +1,155 @@
+"""
+
+Reverse dependency impact of changed recipes
+
+Maps a set of changed paths to the recipe versions they modify, then follows the
+`requires`/`tool_requires` edges extracted by `recipe_index.py` to find every recipe
+version depending on them. The result is printed in topological order, grouped in
+levels: all the recipes of a level can be built in parallel once the previous levels
+are done, so a build farm can schedule them leaves first and shard each level.
+
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from recipe_index import DEFAULT_DATABASE, ROOT_DIR, connect, refresh
+
+
+ALL_VERSIONS = None
+
+
+def changed_recipes(paths):
+    """ {recipe: set of folders, or ALL_VERSIONS when config.yml changed} for the changed paths """
+    changed = {}
+    for path in paths:
+        parts = os.path.normpath(path).replace(os.sep, "/").split("/")
+        if len(parts) < 3 or parts[0] != "recipes":
+            continue
+        recipe = parts[1]
+        if len(parts) == 3 or changed.get(recipe, set()) is ALL_VERSIONS:
+            changed[recipe] = ALL_VERSIONS
+        else:
+            changed.setdefault(recipe, set()).add(parts[2])
+    return changed
+
+
+def git_changed_files(revisions):
+    res = subprocess.run(["git", "diff", "--name-only", revisions], capture_output=True, text=True, check=True,
+                         cwd=ROOT_DIR)
+    return res.stdout.split()
+
+
+class Index:
+    """
+       Versions and requirement edges of every recipe, loaded from the recipe index
+    """
+
+    def __init__(self, connection, kinds):
+        self.versions = defaultdict(dict)  # recipe -> {version: folder}
+        for recipe, version, folder in connection.execute("SELECT recipe, version, folder FROM versions"):
+            self.versions[recipe][version] = folder
+        self.dependents = defaultdict(list)  # required name -> [(recipe, folder, version, conditional)]
+        placeholders = ", ".join("?" * len(kinds))
+        for recipe, folder, name, version, conditional in connection.execute(
+                f"SELECT recipe, folder, name, version, conditional FROM requirements "
+                f"WHERE kind IN ({placeholders}) AND name IS NOT NULL", kinds):
+            if name != recipe:
+                self.dependents[name].append((recipe, folder, version, conditional))
+
+    def versions_in_folders(self, recipe, folders):
+        versions = self.versions.get(recipe, {})
+        return {v for v, folder in versions.items() if folders is ALL_VERSIONS or folder in folders}
+
+
+def _matches(version, affected_versions):
+    """ Whether a required version may resolve to one of the affected versions """
+    if version is None or version.startswith("[") or "{" in version:
+        return True  # version ranges and computed versions are assumed to match
+    return version in affected_versions
+
+
+def impacted(index, changed):
+    """ {recipe: affected versions} for the changed recipes and all their dependents """
+    affected = {recipe: index.versions_in_folders(recipe, folders) for recipe, folders in changed.items()}
+    queue = list(affected)
+    while queue:
+        name = queue.pop()
+        for recipe, folder, version, _ in index.dependents.get(name, []):
+            if not _matches(version, affected[name]):
+                continue
+            versions = index.versions_in_folders(recipe, {folder})
+            if not versions <= affected.get(recipe, set()):
+                affected[recipe] = affected.get(recipe, set()) | versions
+                queue.append(recipe)
+    return affected
+
+
+def topological_levels(index, affected):
+    """ Affected recipes grouped in levels, each level only depends on the previous ones """
+    requires = {recipe: set() for recipe in affected}
+    for name in affected:
+        for recipe, _, _, _ in index.dependents.get(name, []):
+            if recipe in affected:
+                requires[recipe].add(name)
+    levels = []
+    remaining = dict(requires)
+    while remaining:
+        level = sorted(r for r, deps in remaining.items() if not deps & remaining.keys())
+        if not level:
+            # Dependency cycle, build what is left of it together
+            level = sorted(remaining)
+        levels.append(level)
+        for recipe in level:
+            del remaining[recipe]
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List the recipes impacted by a set of changed files, in build order."
+    )
+    parser.add_argument("paths", nargs="*",
+                        help="changed files, relative to the repository root (default: read from stdin).")
+    parser.add_argument("--git-diff", metavar="BASE...HEAD", help="use the files changed between two git revisions.")
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help="SQLite database of the recipe index.")
+    parser.add_argument("--kinds", default="requires,build_requires,tool_requires",
+                        help="comma separated requirement kinds to follow.")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="split each level in this number of shards, round robin.")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    if args.git_diff:
+        paths = git_changed_files(args.git_diff)
+    else:
+        paths = args.paths or sys.stdin.read().split()
+
+    connection = connect(args.database)
+    _, _, errors = refresh(connection)
+    for error in errors:
+        print(f"Could not parse {error}", file=sys.stderr)
+    index = Index(connection, args.kinds.split(","))
+
+    affected = impacted(index, changed_recipes(paths))
+    levels = topological_levels(index, affected)
+
+    result = [[[{"recipe": recipe, "versions": sorted(affected[recipe])} for recipe in level[shard::args.shards]]
+               for shard in range(args.shards)]
+              for level in levels]
+    if args.format == "json":
+        print(json.dumps({"levels": result}, indent=4))
+    else:
+        for number, shards in enumerate(result):
+            for shard, items in enumerate(shards):
+                for item in items:
+                    print(f"{number} {shard} {item['recipe']} {' '.join(item['versions'])}")
+    print(f"{len(affected)} recipes impacted, {len(levels)} levels", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
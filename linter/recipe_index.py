@@ -0,0 +1,367 @@
+"""
+
+Static index of the recipes in ConanCenterIndex
+
+Every `config.yml`, `conandata.yml` and `conanfile.py` is parsed without Conan (no recipe
+code is executed) and stored in a SQLite database. Later runs only parse again the files
+whose mtime and content changed, so the index stays up to date in a fraction of a second
+and queries answer in milliseconds instead of grepping the whole `recipes/` folder.
+
+"""
+
+import argparse
+import ast
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import yaml
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATABASE = os.path.join(ROOT_DIR, ".linter_cache", "recipe_index.sqlite")
+
+# Bump when the tables or the parsing change, the database is then rebuilt
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE files (path TEXT PRIMARY KEY, recipe TEXT, folder TEXT, mtime REAL, size INTEGER, sha256 TEXT);
+CREATE TABLE versions (path TEXT, recipe TEXT, version TEXT, folder TEXT);
+CREATE TABLE attributes (path TEXT, recipe TEXT, folder TEXT, name TEXT, value TEXT);
+CREATE TABLE options (path TEXT, recipe TEXT, folder TEXT, option TEXT, "values" TEXT, "default" TEXT);
+CREATE TABLE requirements (path TEXT, recipe TEXT, folder TEXT, kind TEXT, ref TEXT, name TEXT, version TEXT,
+                           line INTEGER, conditional INTEGER);
+CREATE TABLE sources (path TEXT, recipe TEXT, folder TEXT, version TEXT, variant TEXT, url TEXT, sha256 TEXT);
+CREATE TABLE patches (path TEXT, recipe TEXT, folder TEXT, version TEXT, patch_file TEXT, patch_type TEXT,
+                      patch_description TEXT, patch_source TEXT, base_path TEXT);
+CREATE INDEX versions_recipe ON versions (recipe);
+CREATE INDEX options_recipe ON options (recipe);
+CREATE INDEX requirements_recipe ON requirements (recipe);
+CREATE INDEX requirements_name ON requirements (name);
+CREATE INDEX sources_recipe ON sources (recipe);
+CREATE INDEX patches_recipe ON patches (recipe);
+"""
+DATA_TABLES = ["versions", "attributes", "options", "requirements", "sources", "patches"]
+
+REQUIRE_KINDS = ["requires", "build_requires", "tool_requires", "test_requires"]
+ATTRIBUTES = ["name", "description", "license", "homepage", "topics", "package_type", "settings"]
+
+_YAML_LOADER = getattr(yaml, "CBaseLoader", yaml.BaseLoader)
+
+
+def split_reference(ref):
+    """ (name, version) of a reference like `zlib/1.2.13`, `openssl/[>=1.1 <4]@user/channel` """
+    if not ref or "/" not in ref:
+        return ref or None, None
+    name, version = ref.split("/", 1)
+    version = version.split("@", 1)[0].split("#", 1)[0]
+    return name, version
+
+
+class ConanfileParser(ast.NodeVisitor):
+    """
+       Extract attributes, options and requirements from the source of a conanfile
+    """
+
+    def __init__(self, source, recipe_name=None):
+        self.source = source
+        self.recipe_name = recipe_name
+        self.attributes = {}
+        self.options = {}
+        self.default_options = {}
+        self.requirements = []
+        self._conditional = 0
+        self._in_function = 0
+
+    def _literal(self, node):
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError):
+            return ast.get_source_segment(self.source, node)
+
+    def _reference(self, node):
+        """ Reference string of a requirement argument, f-strings keep their `{expressions}` """
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(str(value.value))
+                elif ast.get_source_segment(self.source, value.value) == "self.name" and self.recipe_name:
+                    parts.append(self.recipe_name)
+                else:
+                    parts.append("{" + (ast.get_source_segment(self.source, value.value) or "") + "}")
+            return "".join(parts)
+        if isinstance(node, ast.Call) and ast.get_source_segment(self.source, node) == "str(self.ref)":
+            return f"{self.recipe_name}/{{self.version}}" if self.recipe_name else None
+        return None
+
+    def _add_requirement(self, kind, node, lineno):
+        ref = self._reference(node)
+        name, version = split_reference(ref)
+        if name and "{" in name:
+            name = None
+        self.requirements.append((kind, ref or ast.get_source_segment(self.source, node), name, version,
+                                  lineno, int(self._conditional > 0)))
+
+    def _class_attribute(self, name, value):
+        if name in ATTRIBUTES:
+            self.attributes[name] = self._literal(value)
+        elif name == "options" and isinstance(value, ast.Dict):
+            for key, values in zip(value.keys, value.values):
+                if isinstance(key, ast.Constant):
+                    self.options[key.value] = self._literal(values)
+        elif name == "default_options":
+            default_options = self._literal(value)
+            if isinstance(default_options, str):
+                default_options = [default_options]
+            if isinstance(default_options, dict):
+                self.default_options.update(default_options)
+            elif isinstance(default_options, (list, tuple)):
+                for item in default_options:
+                    if isinstance(item, str) and "=" in item:
+                        key, item_value = item.split("=", 1)
+                        self.default_options[key.strip()] = item_value.strip()
+        elif name in REQUIRE_KINDS:
+            refs = value.elts if isinstance(value, (ast.Tuple, ast.List)) else [value]
+            for ref in refs:
+                self._add_requirement(name, ref, ref.lineno)
+
+    def visit_ClassDef(self, node):
+        for statement in node.body:
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 and \
+               isinstance(statement.targets[0], ast.Name):
+                self._class_attribute(statement.targets[0].id, statement.value)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        self._in_function += 1
+        self.generic_visit(node)
+        self._in_function -= 1
+
+    def _visit_conditional(self, node):
+        self._conditional += 1
+        self.generic_visit(node)
+        self._conditional -= 1
+
+    visit_If = visit_IfExp = visit_For = visit_While = visit_Try = visit_With = _visit_conditional
+
+    def visit_Call(self, node):
+        func = node.func
+        if self._in_function and isinstance(func, ast.Attribute) and func.attr in REQUIRE_KINDS and \
+           isinstance(func.value, ast.Name) and func.value.id == "self" and node.args:
+            self._add_requirement(func.attr, node.args[0], node.lineno)
+        self.generic_visit(node)
+
+
+def parse_conanfile(path, recipe_name=None):
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    parser = ConanfileParser(source, recipe_name)
+    parser.visit(ast.parse(source, filename=path))
+    return parser
+
+
+def _walk_sources(data, variant=()):
+    """ Yield (variant, url, sha256) for every download described in a `sources` entry """
+    if isinstance(data, list):
+        for item in data:
+            yield from _walk_sources(item, variant)
+    elif isinstance(data, dict):
+        if "url" in data:
+            urls = data["url"] if isinstance(data["url"], list) else [data["url"]]
+            for url in urls:
+                yield "/".join(variant) or None, url, data.get("sha256")
+        else:
+            for key, value in data.items():
+                yield from _walk_sources(value, variant + (key,))
+
+
+def load_yaml(path):
+    with open(path, encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
+def _as_text(value):
+    return value if value is None or isinstance(value, str) else json.dumps(value)
+
+
+def index_rows(path, recipe, folder):
+    """ Rows to insert in each table for one file of the index, without their `path` column """
+    rows = {table: [] for table in DATA_TABLES}
+    filename = os.path.basename(path)
+    if filename == "config.yml":
+        for version, info in (load_yaml(path).get("versions") or {}).items():
+            rows["versions"].append((recipe, version, (info or {}).get("folder")))
+    elif filename == "conandata.yml":
+        data = load_yaml(path)
+        for version, sources in (data.get("sources") or {}).items():
+            for variant, url, sha256 in _walk_sources(sources):
+                rows["sources"].append((recipe, folder, version, variant, _as_text(url), _as_text(sha256)))
+        for version, patches in (data.get("patches") or {}).items():
+            for patch in patches or []:
+                if isinstance(patch, dict):
+                    rows["patches"].append((recipe, folder, version, *(_as_text(patch.get(field)) for field in (
+                        "patch_file", "patch_type", "patch_description", "patch_source", "base_path"))))
+    elif filename == "conanfile.py":
+        conanfile = parse_conanfile(path, recipe)
+        for name, value in conanfile.attributes.items():
+            rows["attributes"].append((recipe, folder, name, _as_text(value)))
+        for option in sorted(set(conanfile.options) | set(conanfile.default_options)):
+            rows["options"].append((recipe, folder, option, _as_text(conanfile.options.get(option)),
+                                    _as_text(conanfile.default_options.get(option))))
+        for requirement in conanfile.requirements:
+            rows["requirements"].append((recipe, folder, *requirement))
+    return rows
+
+
+def index_files(root):
+    """ {path: (recipe, folder)} of every file of the index, paths relative to `root` """
+    files = {}
+    for path in glob.glob(os.path.join(root, "recipes", "*", "config.yml")):
+        files[os.path.relpath(path, root)] = (os.path.basename(os.path.dirname(path)), None)
+    for pattern in ("conandata.yml", "conanfile.py"):
+        for path in glob.glob(os.path.join(root, "recipes", "*", "*", pattern)):
+            folder = os.path.dirname(path)
+            files[os.path.relpath(path, root)] = (os.path.basename(os.path.dirname(folder)), os.path.basename(folder))
+    return files
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def connect(database):
+    os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+    connection = sqlite3.connect(database)
+    if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        for (table,) in connection.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall():
+            connection.execute(f"DROP TABLE {table}")
+        connection.executescript(SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.commit()
+    return connection
+
+
+def refresh(connection, root=ROOT_DIR):
+    """ Parse again the files whose mtime and content changed, return (parsed, removed, errors) """
+    known = {path: (mtime, size, sha256) for path, mtime, size, sha256
+             in connection.execute("SELECT path, mtime, size, sha256 FROM files")}
+    current = index_files(root)
+    parsed, errors = [], []
+    with connection:
+        removed = [path for path in known if path not in current]
+        for path in removed:
+            _delete(connection, path)
+        for path, (recipe, folder) in sorted(current.items()):
+            full_path = os.path.join(root, path)
+            stat = os.stat(full_path)
+            previous = known.get(path)
+            if previous and previous[0] == stat.st_mtime and previous[1] == stat.st_size:
+                continue
+            sha256 = _sha256(full_path)
+            if not previous or previous[2] != sha256:
+                try:
+                    rows = index_rows(full_path, recipe, folder)
+                except (SyntaxError, ValueError, yaml.YAMLError, AttributeError) as error:
+                    errors.append(f"{path}: {error}")
+                    rows = {}
+                _delete(connection, path)
+                for table, table_rows in rows.items():
+                    if table_rows:
+                        placeholders = ", ".join("?" * (len(table_rows[0]) + 1))
+                        connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})",
+                                               [(path, *row) for row in table_rows])
+                parsed.append(path)
+            connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                               (path, recipe, folder, stat.st_mtime, stat.st_size, sha256))
+    return parsed, removed, errors
+
+
+def _delete(connection, path):
+    connection.execute("DELETE FROM files WHERE path = ?", (path,))
+    for table in DATA_TABLES:
+        connection.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+
+def query_requires(connection, pattern):
+    """ Requirements matching `name` or `name/version-pattern` (fnmatch syntax) """
+    name, version = split_reference(pattern)
+    rows = connection.execute("SELECT recipe, folder, kind, ref, version, line, conditional, path FROM requirements "
+                              "WHERE name = ? ORDER BY recipe, folder, line", (name,)).fetchall()
+    return [row for row in rows if version is None or fnmatch.fnmatch(row[4] or "", version)]
+
+
+def _print_rows(rows, header):
+    if not rows:
+        return
+    rows = [tuple("" if value is None else str(value) for value in row) for row in rows]
+    widths = [max(len(value) for value in column) for column in zip(header, *rows)]
+    for row in [header] + rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and query a static index of the ConanCenterIndex recipes."
+    )
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help="SQLite database of the index.")
+    parser.add_argument("--refresh", action="store_true", help="refresh the index before running a query.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("refresh", help="parse the files which changed since the last run.")
+    requires = subparsers.add_parser("requires", help="recipes requiring a reference, e.g. `openssl/3.*`.")
+    requires.add_argument("reference")
+    for command, help_text in (("versions", "versions of a recipe and their folder."),
+                               ("options", "options of a recipe and their default value."),
+                               ("sources", "source URLs and checksums of a recipe."),
+                               ("patches", "patches of a recipe.")):
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("recipe")
+        if command in ("sources", "patches"):
+            subparser.add_argument("version", nargs="?")
+    sql = subparsers.add_parser("sql", help="run a SQL query on the index.")
+    sql.add_argument("query")
+    args = parser.parse_args()
+
+    start = time.time()
+    connection = connect(args.database)
+    if args.command == "refresh" or args.refresh or \
+       not connection.execute("SELECT count(*) FROM files").fetchone()[0]:
+        parsed, removed, errors = refresh(connection)
+        for error in errors:
+            print(f"Could not parse {error}", file=sys.stderr)
+        print(f"Index refreshed in {time.time() - start:.2f}s: {len(parsed)} files parsed, {len(removed)} removed",
+              file=sys.stderr)
+
+    if args.command == "requires":
+        _print_rows(query_requires(connection, args.reference),
+                    ("recipe", "folder", "kind", "ref", "version", "line", "conditional", "path"))
+    elif args.command == "versions":
+        _print_rows(connection.execute("SELECT version, folder FROM versions WHERE recipe = ?",
+                                       (args.recipe,)).fetchall(), ("version", "folder"))
+    elif args.command == "options":
+        _print_rows(connection.execute('SELECT folder, option, "values", "default" FROM options WHERE recipe = ? '
+                                       'ORDER BY folder, option', (args.recipe,)).fetchall(),
+                    ("folder", "option", "values", "default"))
+    elif args.command in ("sources", "patches"):
+        columns = "version, variant, url, sha256" if args.command == "sources" else \
+                  "version, patch_file, patch_type, patch_description"
+        query = f"SELECT folder, {columns} FROM {args.command} WHERE recipe = ?"
+        params = [args.recipe]
+        if args.version:
+            query += " AND version = ?"
+            params.append(args.version)
+        _print_rows(connection.execute(query, params).fetchall(), tuple(["folder"] + columns.split(", ")))
+    elif args.command == "sql":
+        cursor = connection.execute(args.query)
+        _print_rows(cursor.fetchall(), tuple(d[0] for d in cursor.description or []))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+
+Offline, content-addressed mirror of the sources listed in conandata.yml
+
+Every `sources` entry of the selected recipes is downloaded once, verified against its
+sha256 and stored as `<store>/<sha256>`, next to a `<sha256>.json` file listing the
+references using it. This is the layout of Conan's backup sources, so once the store
+is served (`serve` command) the builders can resolve `get(self, **self.conan_data["sources"][...])`
+locally by setting `core.sources:download_urls=["http://<mirror>/", "origin"]`.
+
+"""
+
+import argparse
+import fnmatch
+import functools
+import hashlib
+import http.server
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from recipe_index import DEFAULT_DATABASE, ROOT_DIR, connect, refresh
+
+
+DEFAULT_STORE = os.path.join(ROOT_DIR, ".linter_cache", "sources")
+CHUNK_SIZE = 1 << 20
+
+
+def selected_sources(connection, patterns):
+    """ {sha256: {"urls": [...], "references": {ref: [urls]}}} for the recipes matching `name[/version]` patterns """
+    sources = {}
+    for recipe, version, url, sha256 in connection.execute(
+            "SELECT recipe, version, url, sha256 FROM sources WHERE sha256 IS NOT NULL ORDER BY rowid"):
+        ref = f"{recipe}/{version}"
+        if patterns and not any(fnmatch.fnmatch(ref, p) or fnmatch.fnmatch(recipe, p) for p in patterns):
+            continue
+        entry = sources.setdefault(sha256.lower(), {"urls": [], "references": defaultdict(list)})
+        if url not in entry["urls"]:
+            entry["urls"].append(url)
+        entry["references"][ref].append(url)
+    return sources
+
+
+def _write_summary(store, sha256, references):
+    """ Merge the references using a file into its `<sha256>.json` summary """
+    summary_path = os.path.join(store, f"{sha256}.json")
+    summary = {"references": {}}
+    if os.path.exists(summary_path):
+        with open(summary_path, encoding="utf-8") as f:
+            summary = json.load(f)
+    for ref, urls in references.items():
+        known = summary["references"].setdefault(ref, [])
+        known.extend(url for url in urls if url not in known)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
+
+
+def fetch(store, sha256, entry, timeout):
+    """ Download one file into the store if missing, return (status, size, error) """
+    path = os.path.join(store, sha256)
+    if os.path.exists(path):
+        _write_summary(store, sha256, entry["references"])
+        return "hit", os.path.getsize(path), None
+    errors = []
+    for url in entry["urls"]:
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            checksum = hashlib.sha256()
+            with urllib.request.urlopen(url, timeout=timeout) as response, open(tmp, "wb") as f:
+                for chunk in iter(functools.partial(response.read, CHUNK_SIZE), b""):
+                    checksum.update(chunk)
+                    f.write(chunk)
+            if checksum.hexdigest() != sha256:
+                raise ValueError(f"sha256 mismatch, got {checksum.hexdigest()}")
+            os.replace(tmp, path)
+            _write_summary(store, sha256, entry["references"])
+            return "downloaded", os.path.getsize(path), None
+        except (OSError, ValueError) as error:
+            errors.append(f"{url}: {error}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return "failed", 0, "; ".join(errors)
+
+
+def _human_size(size):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+
+def fetch_command(args):
+    connection = connect(args.database)
+    refresh(connection)
+    sources = selected_sources(connection, args.references)
+    os.makedirs(args.store, exist_ok=True)
+
+    start = time.time()
+    stats = defaultdict(int)
+    sizes = defaultdict(int)
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {sha256: executor.submit(fetch, args.store, sha256, entry, args.timeout)
+                   for sha256, entry in sources.items()}
+        for sha256, future in futures.items():
+            status, size, error = future.result()
+            stats[status] += 1
+            sizes[status] += size
+            if error:
+                refs = ", ".join(sorted(sources[sha256]["references"]))
+                print(f"Could not fetch {sha256} ({refs}): {error}", file=sys.stderr)
+
+    total = len(sources)
+    hit_ratio = stats["hit"] / total if total else 0.0
+    print(f"{total} sources in {time.time() - start:.1f}s: {stats['hit']} already in the store, "
+          f"{stats['downloaded']} downloaded ({_human_size(sizes['downloaded'])}), {stats['failed']} failed")
+    print(f"Hit ratio {hit_ratio:.1%}, {_human_size(sizes['hit'])} saved")
+    return 1 if stats["failed"] else 0
+
+
+class MirrorRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+       Serve the store, counting hits, misses and bytes served
+    """
+
+    stats = defaultdict(int)
+    lock = threading.Lock()
+
+    def send_head(self):
+        result = super().send_head()
+        name = os.path.basename(self.path.split("?", 1)[0])
+        if not name.endswith(".json"):
+            path = self.translate_path(self.path)
+            with self.lock:
+                if result is not None and os.path.isfile(path):
+                    self.stats["hits"] += 1
+                    self.stats["bytes"] += os.path.getsize(path)
+                else:
+                    self.stats["misses"] += 1
+        return result
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def serve_command(args):
+    handler = functools.partial(MirrorRequestHandler, directory=args.store)
+    server = http.server.ThreadingHTTPServer((args.bind, args.port), handler)
+    server.quiet = args.quiet
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Serving {args.store} on http://{args.bind}:{server.server_port}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = MirrorRequestHandler.stats
+        requests = stats["hits"] + stats["misses"]
+        hit_ratio = stats["hits"] / requests if requests else 0.0
+        print(f"{requests} requests, hit ratio {hit_ratio:.1%}, {_human_size(stats['bytes'])} served from the store",
+              file=sys.stderr)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and serve a content-addressed mirror of the sources listed in conandata.yml files."
+    )
+    parser.add_argument("--store", default=DEFAULT_STORE, help="directory of the content-addressed store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch_parser = subparsers.add_parser("fetch", help="download the sources missing from the store.")
+    fetch_parser.add_argument("references", nargs="*",
+                              help="recipes or references to mirror, fnmatch patterns like `zlib` or `boost/1.8*` "
+                                   "(default: everything).")
+    fetch_parser.add_argument("--database", default=DEFAULT_DATABASE, help="SQLite database of the recipe index.")
+    fetch_parser.add_argument("--jobs", "-j", type=int, default=8, help="number of parallel downloads.")
+    fetch_parser.add_argument("--timeout", type=float, default=60, help="timeout of each download, in seconds.")
+    fetch_parser.set_defaults(func=fetch_command)
+
+    serve_parser = subparsers.add_parser("serve", help="serve the store over HTTP.")
+    serve_parser.add_argument("--bind", default="127.0.0.1", help="address to listen on.")
+    serve_parser.add_argument("--port", type=int, default=8000, help="port to listen on.")
+    serve_parser.add_argument("--quiet", action="store_true", help="do not log every request.")
+    serve_parser.set_defaults(func=serve_command)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 
 def file_path(a_string):
@@ -7,3 +10,51 @@ def file_path(a_string):
     if not isfile(a_string):
         raise argparse.ArgumentTypeError(f"{a_string} does not point to a file")
     return a_string
+
+
+def files_argument(filename):
+    """ Argument type accepting a file, a glob pattern or a directory searched for `filename` """
+    def expand(a_string):
+        if glob.has_magic(a_string):
+            files = glob.glob(a_string, recursive=True)
+        elif os.path.isdir(a_string):
+            files = glob.glob(os.path.join(a_string, "**", filename), recursive=True)
+        else:
+            files = [file_path(a_string)]
+        if not files:
+            raise argparse.ArgumentTypeError(f"{a_string} does not match any file")
+        return sorted(files)
+    return expand
+
+
+def add_batch_arguments(parser, filename):
+    parser.add_argument(
+        "path",
+        nargs="+",
+        type=files_argument(filename),
+        help=f"files to validate, glob patterns or directories to search for '{filename}'.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count(),
+        help="number of files validated in parallel.",
+    )
+
+
+def run_batch(lint_file, args):
+    """ Validate every file of the command line, printing the reports in the order of the files """
+    files = sorted({f for files in args.path for f in files})
+    if args.jobs <= 1 or len(files) == 1:
+        _print_reports(map(lint_file, files))
+        return
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        chunksize = max(1, len(files) // (args.jobs * 4))
+        _print_reports(executor.map(lint_file, files, chunksize=chunksize))
+
+
+def _print_reports(reports):
+    for report in reports:
+        for line in report:
+            print(line)
@@ -125,6 +125,15 @@ class ArrowConan(ConanFile):
             "apple-clang": "10",
         }
 
+    @property
+    def _default_simd_level(self):
+        return "sse4_2" if Version(self.version) < "6.0.0" else "default"
+
+    @property
+    def _simd_level_by_x86_64_level(self):
+        # compile-time SIMD level only, the runtime dispatch is left to runtime_simd_level
+        return {"x86-64": None, "x86-64-v2": "sse4_2", "x86-64-v3": "avx2", "x86-64-v4": "avx512"}
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -135,7 +144,7 @@ class ArrowConan(ConanFile):
             del self.options.simd_level
             del self.options.runtime_simd_level
         elif Version(self.version) < "6.0.0":
-            self.options.simd_level = "sse4_2"
+            self.options.simd_level = self._default_simd_level
         if Version(self.version) < "6.0.0":
             del self.options.with_gcs
         if Version(self.version) < "7.0.0":
@@ -148,6 +157,10 @@ class ArrowConan(ConanFile):
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._simd_level_by_x86_64_level and \
+           self.options.get_safe("simd_level") == self._default_simd_level:
+            self.options.simd_level = self._simd_level_by_x86_64_level[x86_64_level]
 
     def validate(self):
         if self.info.settings.compiler.cppstd:
@@ -206,6 +219,12 @@ class ArrowConan(ConanFile):
 
         if Version(self.version) < "6.0.0" and self.options.get_safe("simd_level") == "default":
             raise ConanInvalidConfiguration(f"In {self.ref}, simd_level options is not supported `default` value.")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and "simd_level" in self.options and \
+           str(self.options.simd_level) != str(self._simd_level_by_x86_64_level.get(x86_64_level, "")):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: simd_level={self.options.simd_level} does not match user.cci:x86_64_level={x86_64_level}"
+            )
 
     def layout(self):
         cmake_layout(self, src_folder="src")
@@ -1,4 +1,5 @@
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
 from conan.tools.env import VirtualBuildEnv
 from conan.tools.files import export_conandata_patches, apply_conandata_patches, get, copy, rm, rmdir
@@ -39,6 +40,10 @@ class CBlosc2Conan(ConanFile):
         "with_plugins": True,
     }
 
+    @property
+    def _simd_intrinsics_by_x86_64_level(self):
+        return {"x86-64": "sse2", "x86-64-v2": "sse2", "x86-64-v3": "avx2", "x86-64-v4": "avx2"}
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -53,6 +58,10 @@ class CBlosc2Conan(ConanFile):
             self.options.rm_safe("fPIC")
         self.settings.rm_safe("compiler.cppstd")
         self.settings.rm_safe("compiler.libcxx")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._simd_intrinsics_by_x86_64_level and \
+           self.options.simd_intrinsics == self.default_options["simd_intrinsics"]:
+            self.options.simd_intrinsics = self._simd_intrinsics_by_x86_64_level[x86_64_level]
 
         # c-blosc2 uses zlib-ng with zlib compat options.
         if self.options.with_zlib == "zlib-ng-compat":
@@ -73,6 +82,14 @@ class CBlosc2Conan(ConanFile):
         if self.options.with_zstd:
             self.requires("zstd/1.5.4")
 
+    def validate(self):
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and \
+           str(self.options.simd_intrinsics) != self._simd_intrinsics_by_x86_64_level.get(x86_64_level):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: simd_intrinsics={self.options.simd_intrinsics} does not match user.cci:x86_64_level={x86_64_level}"
+            )
+
     def _cmake_new_enough(self, required_version):
         try:
             import re
@@ -1,11 +1,20 @@
-from conans import AutoToolsBuildEnvironment, ConanFile, MSBuild, tools
-from conans.errors import ConanInvalidConfiguration
+from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
+from conan.tools.apple import is_apple_os
+from conan.tools.build import cross_building
+from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
+from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, mkdir, rename, replace_in_file, rm, rmdir, unzip
+from conan.tools.gnu import Autotools, AutotoolsDeps, AutotoolsToolchain, PkgConfigDeps
+from conan.tools.layout import basic_layout
+from conan.tools.microsoft import MSBuild, MSBuildDeps, MSBuildToolchain, VCVars, check_min_vs, is_msvc, msvc_runtime_flag
+from conan.tools.scm import Version
 from io import StringIO
 import os
 import re
+import shutil
 import textwrap
 
-required_conan_version = ">=1.33.0"
+required_conan_version = ">=1.58.0"
 
 
 class CPythonConan(ConanFile):
@@ -15,13 +24,13 @@ class CPythonConan(ConanFile):
     description = "Python is a programming language that lets you work quickly and integrate systems more effectively."
     topics = ("python", "cpython", "language", "script")
     license = ("Python-2.0",)
-    exports_sources = "patches/**"
     settings = "os", "arch", "compiler", "build_type"
     options = {
         "shared": [True, False],
         "fPIC": [True, False],
         "optimizations": [True, False],
         "lto": [True, False],
+        "enable_bolt": [True, False],
         "docstrings": [True, False],
         "pymalloc": [True, False],
         "with_bz2": [True, False],
@@ -45,6 +54,7 @@ class CPythonConan(ConanFile):
         "fPIC": True,
         "optimizations": False,
         "lto": False,
+        "enable_bolt": False,
         "docstrings": True,
         "pymalloc": True,
         "with_bz2": True,
@@ -64,11 +74,9 @@ class CPythonConan(ConanFile):
         "env_vars": True,
     }
 
-    _autotools = None
-
     @property
-    def _source_subfolder(self):
-        return "source_subfolder"
+    def _settings_build(self):
+        return getattr(self, "settings_build", self.settings)
 
     @property
     def _version_number_only(self):
@@ -80,11 +88,11 @@ class CPythonConan(ConanFile):
 
     @property
     def _supports_modules(self):
-        return self.settings.compiler != "Visual Studio" or self.options.shared
+        return not is_msvc(self) or self.options.shared
 
     @property
     def _version_suffix(self):
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             joiner = ""
         else:
             joiner = "."
@@ -92,16 +100,24 @@ class CPythonConan(ConanFile):
 
     @property
     def _is_py3(self):
-        return tools.Version(self._version_number_only).major == "3"
+        return Version(self._version_number_only).major == 3
 
     @property
     def _is_py2(self):
-        return tools.Version(self._version_number_only).major == "2"
+        return Version(self._version_number_only).major == 2
+
+    @property
+    def _uses_setup_py(self):
+        # Since 3.11, the extension modules are detected by configure (pkg-config) and no longer by setup.py
+        return Version(self._version_number_only) < "3.11"
+
+    def export_sources(self):
+        export_conandata_patches(self)
 
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             del self.options.lto
             del self.options.docstrings
             del self.options.pymalloc
@@ -115,80 +131,51 @@ class CPythonConan(ConanFile):
             # Python 3.xx does not support following options
             del self.options.with_bsddb
             del self.options.unicode
-
-        del self.settings.compiler.libcxx
-        del self.settings.compiler.cppstd
+        # --enable-bolt is available since 3.12, llvm-bolt only rewrites ELF binaries
+        if Version(self._version_number_only) < "3.12" or self.settings.os != "Linux" or \
+           self.settings.compiler not in ("gcc", "clang"):
+            del self.options.enable_bolt
 
     def configure(self):
         if self.options.shared:
-            del self.options.fPIC
+            self.options.rm_safe("fPIC")
+        self.settings.rm_safe("compiler.libcxx")
+        self.settings.rm_safe("compiler.cppstd")
         if not self._supports_modules:
-                del self.options.with_bz2
-                del self.options.with_sqlite3
-                del self.options.with_tkinter
-
-                del self.options.with_bsddb
-                del self.options.with_lzma
-        if self.settings.compiler == "Visual Studio":
-            # The msbuild generator only works with Visual Studio
-            self.generators.append("MSBuildDeps")
-
-    def validate(self):
-        if self.options.shared:
-            if self.settings.compiler == "Visual Studio" and "MT" in self.settings.compiler.runtime:
-                raise ConanInvalidConfiguration("cpython does not support MT(d) runtime when building a shared cpython library")
-        if self.settings.compiler == "Visual Studio":
-            if self.options.optimizations:
-                raise ConanInvalidConfiguration("This recipe does not support optimized MSVC cpython builds (yet)")
-                # FIXME: should probably throw when cross building
-                # FIXME: optimizations for Visual Studio, before building the final `build_type`:
-                # 1. build the MSVC PGInstrument build_type,
-                # 2. run the instrumented binaries, (PGInstrument should have created a `python.bat` file in the PCbuild folder)
-                # 3. build the MSVC PGUpdate build_type
-            if self.settings.build_type == "Debug" and "d" not in self.settings.compiler.runtime:
-                raise ConanInvalidConfiguration("Building debug cpython requires a debug runtime (Debug cpython requires _CrtReportMode symbol, which only debug runtimes define)")
-            if self._is_py2:
-                if self.settings.compiler.version >= tools.Version("14"):
-                    self.output.warn("Visual Studio versions 14 and higher were never officially supported by the CPython developers")
-            if str(self.settings.arch) not in self._msvc_archs:
-                raise ConanInvalidConfiguration("Visual Studio does not support this architecture")
-
-            if not self.options.shared and tools.Version(self._version_number_only) >= "3.10":
-                raise ConanInvalidConfiguration("Static msvc build disabled (>=3.10) due to \"AttributeError: module 'sys' has no attribute 'winver'\"")
+            self.options.rm_safe("with_bz2")
+            self.options.rm_safe("with_sqlite3")
+            self.options.rm_safe("with_tkinter")
 
-        if self.options.get_safe("with_curses", False) and not self.options["ncurses"].with_widec:
-            raise ConanInvalidConfiguration("cpython requires ncurses with wide character support")
-
-    def package_id(self):
-        del self.info.options.env_vars
+            self.options.rm_safe("with_bsddb")
+            self.options.rm_safe("with_lzma")
 
-    def source(self):
-        tools.get(**self.conan_data["sources"][self.version],
-                  destination=self._source_subfolder, strip_root=True)
+    def layout(self):
+        basic_layout(self, src_folder="src")
 
     @property
     def _with_libffi(self):
         # cpython 3.7.x on MSVC uses an ancient libffi 2.00-beta (which is not available at cci, and is API/ABI incompatible with current 3.2+)
         return self._supports_modules \
-               and (self.settings.compiler != "Visual Studio" or tools.Version(self._version_number_only) >= "3.8")
+               and (not is_msvc(self) or Version(self._version_number_only) >= "3.8")
 
     def requirements(self):
-        self.requires("zlib/1.2.11")
+        self.requires("zlib/1.2.13")
         if self._supports_modules:
-            self.requires("openssl/1.1.1l")
-            self.requires("expat/2.4.1")
+            if Version(self._version_number_only) < "3.10":
+                self.requires("openssl/1.1.1t")
+            else:
+                self.requires("openssl/[>=1.1 <4]")
+            self.requires("expat/2.5.0")
             if self._with_libffi:
-                self.requires("libffi/3.2.1")
-            if tools.Version(self._version_number_only) < "3.8":
+                self.requires("libffi/3.4.4")
+            if Version(self._version_number_only) < "3.8":
                 self.requires("mpdecimal/2.4.2")
-            elif tools.Version(self._version_number_only) < "3.10":
-                self.requires("mpdecimal/2.5.0")
             else:
                 self.requires("mpdecimal/2.5.0")  # FIXME: no 2.5.1 to troubleshoot apple
         if self.settings.os != "Windows":
-            if not tools.is_apple_os(self.settings.os):
+            if not is_apple_os(self):
                 self.requires("libuuid/1.0.3")
-            self.requires("libxcrypt/4.4.25")
+            self.requires("libxcrypt/4.4.28")
         if self.options.get_safe("with_bz2"):
             self.requires("bzip2/1.0.8")
         if self.options.get_safe("with_gdbm", False):
@@ -197,23 +184,95 @@ class CPythonConan(ConanFile):
             # TODO: Add nis when available.
             raise ConanInvalidConfiguration("nis is not available on CCI (yet)")
         if self.options.get_safe("with_sqlite3"):
-            self.requires("sqlite3/3.36.0")
+            self.requires("sqlite3/3.41.1")
         if self.options.get_safe("with_tkinter"):
             self.requires("tk/8.6.10")
         if self.options.get_safe("with_curses", False):
-            self.requires("ncurses/6.2")
+            self.requires("ncurses/6.4")
         if self.options.get_safe("with_bsddb", False):
             self.requires("libdb/5.3.28")
         if self.options.get_safe("with_lzma", False):
-            self.requires("xz_utils/5.2.5")
+            self.requires("xz_utils/5.4.2")
+
+    def package_id(self):
+        del self.info.options.env_vars
+
+    def validate(self):
+        if self.options.shared:
+            if is_msvc(self) and "MT" in msvc_runtime_flag(self):
+                raise ConanInvalidConfiguration("cpython does not support MT(d) runtime when building a shared cpython library")
+        if is_msvc(self):
+            if self.options.optimizations:
+                raise ConanInvalidConfiguration("This recipe does not support optimized MSVC cpython builds (yet)")
+                # FIXME: optimizations for Visual Studio, before building the final `build_type`:
+                # 1. build the MSVC PGInstrument build_type,
+                # 2. run the instrumented binaries, (PGInstrument should have created a `python.bat` file in the PCbuild folder)
+                # 3. build the MSVC PGUpdate build_type
+            if self.settings.build_type == "Debug" and "d" not in msvc_runtime_flag(self):
+                raise ConanInvalidConfiguration("Building debug cpython requires a debug runtime (Debug cpython requires _CrtReportMode symbol, which only debug runtimes define)")
+            if self._is_py2:
+                if check_min_vs(self, "190", raise_invalid=False):
+                    self.output.warning("Visual Studio versions 14 and higher were never officially supported by the CPython developers")
+            if str(self.settings.arch) not in self._msvc_archs:
+                raise ConanInvalidConfiguration("Visual Studio does not support this architecture")
 
-    def _configure_autotools(self):
-        if self._autotools:
-            return self._autotools
-        self._autotools = AutoToolsBuildEnvironment(self, win_bash=tools.os_info.is_windows)
-        self._autotools.libs = []
+            if not self.options.shared and Version(self._version_number_only) >= "3.10":
+                raise ConanInvalidConfiguration("Static msvc build disabled (>=3.10) due to \"AttributeError: module 'sys' has no attribute 'winver'\"")
+            if Version(self._version_number_only) >= "3.11":
+                # FIXME: the PCbuild projects of 3.11+ are not patched for external dependencies (yet)
+                raise ConanInvalidConfiguration(f"{self.ref} cannot be built with msvc yet: the PCbuild projects of 3.11+ "
+                                                "are not patched to use the conan dependencies, use a version < 3.11")
+
+        if (self.options.optimizations or self.options.get_safe("enable_bolt")) and \
+           cross_building(self, skip_x64_x86=True):
+            # The training run of PGO and BOLT executes the instrumented interpreter
+            raise ConanInvalidConfiguration("optimizations and enable_bolt are not supported when cross-building")
+
+        if self._supports_modules:
+            mpdecimal_version = Version(self.dependencies["mpdecimal"].ref.version)
+            if Version(self._version_number_only) < "3.8.0":
+                if mpdecimal_version >= "2.5.0":
+                    raise ConanInvalidConfiguration("cpython versions lesser then 3.8.0 require a mpdecimal lesser then 2.5.0")
+            elif Version(self._version_number_only) >= "3.9.0":
+                if mpdecimal_version < "2.5.0":
+                    raise ConanInvalidConfiguration("cpython 3.9.0 (and newer) requires (at least) mpdecimal 2.5.0")
+
+        if self._with_libffi:
+            if Version(self.dependencies["libffi"].ref.version) >= "3.3" and is_msvc(self) and "d" in msvc_runtime_flag(self):
+                raise ConanInvalidConfiguration("libffi versions >= 3.3 cause 'read access violations' when using a debug runtime (MTd/MDd)")
+
+        if self.options.get_safe("with_curses", False) and not self.dependencies["ncurses"].options.with_widec:
+            raise ConanInvalidConfiguration("cpython requires ncurses with wide character support")
+
+    def validate_build(self):
+        if self.options.get_safe("enable_bolt"):
+            # configure looks up llvm-bolt and merge-fdata in PATH, unless LLVM_BOLT and MERGE_FDATA are set
+            missing = [tool for tool, var in (("llvm-bolt", "LLVM_BOLT"), ("merge-fdata", "MERGE_FDATA"))
+                       if not os.environ.get(var) and not shutil.which(tool)]
+            if missing:
+                raise ConanInvalidConfiguration(f"{self.ref} option enable_bolt=True requires {' and '.join(missing)} "
+                                                "(from LLVM) in PATH, or set the LLVM_BOLT and MERGE_FDATA environment variables")
+
+    def build_requirements(self):
+        if self._settings_build.os == "Windows" and not is_msvc(self):
+            self.win_bash = True
+            if not self.conf.get("tools.microsoft.bash:path", check_type=str):
+                self.tool_requires("msys2/cci.latest")
+        if not is_msvc(self) and not self._uses_setup_py:
+            if not self.conf.get("tools.gnu:pkg_config", check_type=str):
+                self.tool_requires("pkgconf/1.9.3")
+
+    def source(self):
+        get(self, **self.conan_data["sources"][self.version], strip_root=True)
+
+    @property
+    def _msvc_configuration(self):
+        return "Debug" if self.settings.build_type == "Debug" else "Release"
+
+    def _generate_autotools(self):
         yes_no = lambda v: "yes" if v else "no"
-        conf_args = [
+        tc = AutotoolsToolchain(self)
+        tc.configure_args.extend([
             "--enable-shared={}".format(yes_no(self.options.shared)),
             "--with-doc-strings={}".format(yes_no(self.options.docstrings)),
             "--with-pymalloc={}".format(yes_no(self.options.pymalloc)),
@@ -222,93 +281,128 @@ class CPythonConan(ConanFile):
             "--enable-optimizations={}".format(yes_no(self.options.optimizations)),
             "--with-lto={}".format(yes_no(self.options.lto)),
             "--with-pydebug={}".format(yes_no(self.settings.build_type == "Debug")),
-        ]
+        ])
+        if self.options.get_safe("enable_bolt"):
+            # llvm-bolt and merge-fdata availability is checked in validate_build()
+            tc.configure_args.append("--enable-bolt")
         if self._is_py2:
-            conf_args.extend([
+            tc.configure_args.extend([
                 "--enable-unicode={}".format(yes_no(self.options.unicode)),
             ])
         if self._is_py3:
-            conf_args.extend([
+            tc.configure_args.extend([
                 "--with-system-libmpdec",
-                "--with-openssl={}".format(self.deps_cpp_info["openssl"].rootpath),
-                "--enable-loadable-sqlite-extensions={}".format(yes_no(not self.options["sqlite3"].omit_load_extension)),
+                "--with-openssl={}".format(self.dependencies["openssl"].package_folder),
+                "--enable-loadable-sqlite-extensions={}".format(
+                    yes_no(self.options.with_sqlite3 and not self.dependencies["sqlite3"].options.omit_load_extension)),
             ])
-        if self.settings.compiler == "intel":
-            conf_args.extend(["--with-icc"])
-        if tools.get_env("CC") or self.settings.compiler != "gcc":
-            conf_args.append("--without-gcc")
+        if self.settings.compiler == "intel-cc":
+            tc.configure_args.append("--with-icc")
+        if self.settings.compiler != "gcc":
+            tc.configure_args.append("--without-gcc")
         if self.options.with_tkinter:
             tcltk_includes = []
             tcltk_libs = []
-            # FIXME: collect using some conan util (https://github.com/conan-io/conan/issues/7656)
             for dep in ("tcl", "tk", "zlib"):
-                tcltk_includes += ["-I{}".format(d) for d in self.deps_cpp_info[dep].include_paths]
-                tcltk_libs += ["-l{}".format(lib) for lib in self.deps_cpp_info[dep].libs]
-            if self.settings.os == "Linux" and not self.options["tk"].shared:
+                cpp_info = self.dependencies[dep].cpp_info.aggregated_components()
+                tcltk_includes += ["-I{}".format(d) for d in cpp_info.includedirs]
+                tcltk_libs += ["-L{}".format(d) for d in cpp_info.libdirs]
+                tcltk_libs += ["-l{}".format(lib) for lib in cpp_info.libs]
+            if self.settings.os == "Linux" and not self.dependencies["tk"].options.shared:
                 # FIXME: use info from xorg.components (x11, xscrnsaver)
                 tcltk_libs.extend(["-l{}".format(lib) for lib in ("X11", "Xss")])
-            conf_args.extend([
+            tc.configure_args.extend([
                 "--with-tcltk-includes={}".format(" ".join(tcltk_includes)),
                 "--with-tcltk-libs={}".format(" ".join(tcltk_libs)),
             ])
         if self.settings.os in ("Linux", "FreeBSD"):
             # Building _testembed fails due to missing pthread/rt symbols
-            self._autotools.link_flags.append("-lpthread")
-
-        build = None
-        if tools.cross_building(self) and not tools.cross_building(self, skip_x64_x86=True):
+            tc.extra_ldflags.append("-lpthread")
+        if cross_building(self) and not cross_building(self, skip_x64_x86=True):
             # Building from x86_64 to x86 is not a "real" cross build, so set build == host
-            build = tools.get_gnu_triplet(str(self.settings.os), str(self.settings.arch), str(self.settings.compiler))
-        self._autotools.configure(args=conf_args, configure_dir=self._source_subfolder, build=build)
-        return self._autotools
+            tc.update_configure_args({"--build": None, "--host": None})
+        tc.generate()
+
+        AutotoolsDeps(self).generate()
+        if not self._uses_setup_py:
+            PkgConfigDeps(self).generate()
+
+    def _generate_msvc(self):
+        tc = MSBuildToolchain(self)
+        tc.configuration = self._msvc_configuration
+        tc.platform = self._msvc_archs[str(self.settings.arch)]
+        tc.generate()
+
+        deps = MSBuildDeps(self)
+        deps.configuration = self._msvc_configuration
+        deps.platform = self._msvc_archs[str(self.settings.arch)]
+        deps.generate()
+
+        VCVars(self).generate()
+
+    def generate(self):
+        VirtualBuildEnv(self).generate()
+        # The PGO/BOLT training run and the MSVC layout tool execute the freshly built interpreter,
+        # which needs to load the shared dependencies
+        VirtualRunEnv(self).generate(scope="build")
+        if is_msvc(self):
+            self._generate_msvc()
+        else:
+            self._generate_autotools()
 
     def _patch_sources(self):
-        for patch in self.conan_data.get("patches",{}).get(self.version, []):
-            tools.patch(**patch)
-        if self._is_py3 and tools.Version(self._version_number_only) < "3.10":
-            tools.replace_in_file(os.path.join(self._source_subfolder, "setup.py"),
-                                  ":libmpdec.so.2", "mpdec")
-        if self.settings.compiler == "Visual Studio":
+        apply_conandata_patches(self)
+        if self._is_py3 and Version(self._version_number_only) < "3.10":
+            replace_in_file(self, os.path.join(self.source_folder, "setup.py"),
+                            ":libmpdec.so.2", "mpdec")
+        if is_msvc(self):
             runtime_library = {
                 "MT": "MultiThreaded",
                 "MTd": "MultiThreadedDebug",
                 "MD": "MultiThreadedDLL",
                 "MDd": "MultiThreadedDebugDLL",
-            }[str(self.settings.compiler.runtime)]
+            }[msvc_runtime_flag(self)]
             self.output.info("Patching runtime")
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "pyproject.props"),
-                                  "MultiThreadedDLL", runtime_library)
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "pyproject.props"),
-                                  "MultiThreadedDebugDLL", runtime_library)
+            pyproject_props = os.path.join(self.source_folder, "PCbuild", "pyproject.props")
+            replace_in_file(self, pyproject_props, "MultiThreadedDLL", runtime_library)
+            replace_in_file(self, pyproject_props, "MultiThreadedDebugDLL", runtime_library)
+            # Every project of the solution imports pyproject.props: inject the conan toolchain and dependencies there
+            replace_in_file(self, pyproject_props, "</Project>", textwrap.dedent("""\
+                  <Import Project="{}" />
+                  <Import Project="{}" />
+                </Project>""").format(os.path.join(self.generators_folder, MSBuildToolchain.filename),
+                                      os.path.join(self.generators_folder, "conandeps.props")))
 
         # Remove vendored packages
-        tools.rmdir(os.path.join(self._source_subfolder, "Modules", "_decimal", "libmpdec"))
-        tools.rmdir(os.path.join(self._source_subfolder, "Modules", "expat"))
+        rmdir(self, os.path.join(self.source_folder, "Modules", "_decimal", "libmpdec"))
+        rmdir(self, os.path.join(self.source_folder, "Modules", "expat"))
 
-        if self.options.get_safe("with_curses", False):
+        if self.options.get_safe("with_curses", False) and self._uses_setup_py:
             # FIXME: this will link to ALL libraries of ncurses. Only need to link to ncurses(w) (+ eventually tinfo)
-            tools.replace_in_file(os.path.join(self._source_subfolder, "setup.py"),
-                                  "curses_libs = ",
-                                  "curses_libs = {} #".format(repr(self.deps_cpp_info["ncurses"].libs + self.deps_cpp_info["ncurses"].system_libs)))
+            ncurses_info = self.dependencies["ncurses"].cpp_info.aggregated_components()
+            replace_in_file(self, os.path.join(self.source_folder, "setup.py"),
+                            "curses_libs = ",
+                            "curses_libs = {} #".format(repr(ncurses_info.libs + ncurses_info.system_libs)))
 
         # Enable static MSVC cpython
-        if not self.options.shared:
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "pythoncore.vcxproj"),
-                                  "<PreprocessorDefinitions>","<PreprocessorDefinitions>Py_NO_BUILD_SHARED;")
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "pythoncore.vcxproj"),
-                                  "Py_ENABLE_SHARED", "Py_NO_ENABLE_SHARED")
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "pythoncore.vcxproj"),
-                                  "DynamicLibrary", "StaticLibrary")
-
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "python.vcxproj"),
-                                  "<Link>", "<Link><AdditionalDependencies>shlwapi.lib;ws2_32.lib;pathcch.lib;version.lib;%(AdditionalDependencies)</AdditionalDependencies>")
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "python.vcxproj"),
-                                  "<PreprocessorDefinitions>", "<PreprocessorDefinitions>Py_NO_ENABLE_SHARED;")
-
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "pythonw.vcxproj"),
-                                  "<Link>", "<Link><AdditionalDependencies>shlwapi.lib;ws2_32.lib;pathcch.lib;version.lib;%(AdditionalDependencies)</AdditionalDependencies>")
-            tools.replace_in_file(os.path.join(self._source_subfolder, "PCbuild", "pythonw.vcxproj"),
-                                  "<ItemDefinitionGroup>", "<ItemDefinitionGroup><ClCompile><PreprocessorDefinitions>Py_NO_ENABLE_SHARED;%(PreprocessorDefinitions)</PreprocessorDefinitions></ClCompile>")
+        if not self.options.shared and is_msvc(self):
+            pcbuild = os.path.join(self.source_folder, "PCbuild")
+            replace_in_file(self, os.path.join(pcbuild, "pythoncore.vcxproj"),
+                            "<PreprocessorDefinitions>","<PreprocessorDefinitions>Py_NO_BUILD_SHARED;")
+            replace_in_file(self, os.path.join(pcbuild, "pythoncore.vcxproj"),
+                            "Py_ENABLE_SHARED", "Py_NO_ENABLE_SHARED")
+            replace_in_file(self, os.path.join(pcbuild, "pythoncore.vcxproj"),
+                            "DynamicLibrary", "StaticLibrary")
+
+            replace_in_file(self, os.path.join(pcbuild, "python.vcxproj"),
+                            "<Link>", "<Link><AdditionalDependencies>shlwapi.lib;ws2_32.lib;pathcch.lib;version.lib;%(AdditionalDependencies)</AdditionalDependencies>")
+            replace_in_file(self, os.path.join(pcbuild, "python.vcxproj"),
+                            "<PreprocessorDefinitions>", "<PreprocessorDefinitions>Py_NO_ENABLE_SHARED;")
+
+            replace_in_file(self, os.path.join(pcbuild, "pythonw.vcxproj"),
+                            "<Link>", "<Link><AdditionalDependencies>shlwapi.lib;ws2_32.lib;pathcch.lib;version.lib;%(AdditionalDependencies)</AdditionalDependencies>")
+            replace_in_file(self, os.path.join(pcbuild, "pythonw.vcxproj"),
+                            "<ItemDefinitionGroup>", "<ItemDefinitionGroup><ClCompile><PreprocessorDefinitions>Py_NO_ENABLE_SHARED;%(PreprocessorDefinitions)</PreprocessorDefinitions></ClCompile>")
 
     def _upgrade_single_project_file(self, project_file):
         """
@@ -317,22 +411,19 @@ class CPythonConan(ConanFile):
         This is needed for static cpython or for disabled optional dependencies (e.g. tkinter=False)
         Restore it afterwards because it is needed to build some targets.
         """
-        tools.rename(os.path.join(self._source_subfolder, "PCbuild", "pcbuild.sln"),
-                     os.path.join(self._source_subfolder, "PCbuild", "pcbuild.sln.bak"))
-        tools.rename(os.path.join(self._source_subfolder, "PCbuild", "pcbuild.proj"),
-                     os.path.join(self._source_subfolder, "PCbuild", "pcbuild.proj.bak"))
-        with tools.vcvars(self.settings):
-            self.run("devenv \"{}\" /upgrade".format(project_file), run_environment=True)
-        tools.rename(os.path.join(self._source_subfolder, "PCbuild", "pcbuild.sln.bak"),
-                     os.path.join(self._source_subfolder, "PCbuild", "pcbuild.sln"))
-        tools.rename(os.path.join(self._source_subfolder, "PCbuild", "pcbuild.proj.bak"),
-                     os.path.join(self._source_subfolder, "PCbuild", "pcbuild.proj"))
+        pcbuild = os.path.join(self.source_folder, "PCbuild")
+        rename(self, os.path.join(pcbuild, "pcbuild.sln"), os.path.join(pcbuild, "pcbuild.sln.bak"))
+        rename(self, os.path.join(pcbuild, "pcbuild.proj"), os.path.join(pcbuild, "pcbuild.proj.bak"))
+        self.run("devenv \"{}\" /upgrade".format(project_file))
+        rename(self, os.path.join(pcbuild, "pcbuild.sln.bak"), os.path.join(pcbuild, "pcbuild.sln"))
+        rename(self, os.path.join(pcbuild, "pcbuild.proj.bak"), os.path.join(pcbuild, "pcbuild.proj"))
 
     @property
     def _solution_projects(self):
         if self.options.shared:
-            solution_path = os.path.join(self._source_subfolder, "PCbuild", "pcbuild.sln")
-            projects = set(m.group(1) for m in re.finditer("\"([^\"]+)\\.vcxproj\"", open(solution_path).read()))
+            solution_path = os.path.join(self.source_folder, "PCbuild", "pcbuild.sln")
+            with open(solution_path) as solution:
+                projects = set(m.group(1) for m in re.finditer("\"([^\"]+)\\.vcxproj\"", solution.read()))
 
             def project_build(name):
                 if os.path.basename(name) in self._msvc_discarded_projects:
@@ -382,7 +473,7 @@ class CPythonConan(ConanFile):
             "x86": "Win32",
             "x86_64": "x64",
         }
-        if tools.Version(self._version_number_only) >= "3.8":
+        if Version(self._version_number_only) >= "3.8":
             archs.update({
                 "armv7": "ARM",
                 "armv8_32": "ARM",
@@ -392,39 +483,25 @@ class CPythonConan(ConanFile):
 
     def _msvc_build(self):
         msbuild = MSBuild(self)
-        msbuild_properties = {
-            "IncludeExternals": "true",
-        }
+        msbuild.build_type = self._msvc_configuration
+        msbuild.platform = self._msvc_archs[str(self.settings.arch)]
         projects = self._solution_projects
         self.output.info("Building {} Visual Studio projects: {}".format(len(projects), projects))
 
-        with tools.no_op():
-            for project_i, project in enumerate(projects, 1):
-                self.output.info("[{}/{}] Building project '{}'...".format(project_i, len(projects), project))
-                project_file = os.path.join(self._source_subfolder, "PCbuild", project + ".vcxproj")
-                self._upgrade_single_project_file(project_file)
-                msbuild.build(project_file, upgrade_project=False, build_type="Debug" if self.settings.build_type == "Debug" else "Release",
-                              platforms=self._msvc_archs, properties=msbuild_properties)
+        for project_i, project in enumerate(projects, 1):
+            self.output.info("[{}/{}] Building project '{}'...".format(project_i, len(projects), project))
+            project_file = os.path.join(self.source_folder, "PCbuild", project + ".vcxproj")
+            self._upgrade_single_project_file(project_file)
+            self.run("{} /p:IncludeExternals=true".format(msbuild.command(project_file)))
 
     def build(self):
-        # FIXME: these checks belong in validate, but the versions of dependencies are not available there yet
-        if self._supports_modules:
-            if tools.Version(self._version_number_only) < "3.8.0":
-                if tools.Version(self.deps_cpp_info["mpdecimal"].version) >= "2.5.0":
-                    raise ConanInvalidConfiguration("cpython versions lesser then 3.8.0 require a mpdecimal lesser then 2.5.0")
-            elif tools.Version(self._version_number_only) >= "3.9.0":
-                if tools.Version(self.deps_cpp_info["mpdecimal"].version) < "2.5.0":
-                    raise ConanInvalidConfiguration("cpython 3.9.0 (and newer) requires (at least) mpdecimal 2.5.0")
-
-        if self._with_libffi:
-            if tools.Version(self.deps_cpp_info["libffi"].version) >= "3.3" and self.settings.compiler == "Visual Studio" and "d" in str(self.settings.compiler.runtime):
-                raise ConanInvalidConfiguration("libffi versions >= 3.3 cause 'read access violations' when using a debug runtime (MTd/MDd)")
-
         self._patch_sources()
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             self._msvc_build()
         else:
-            autotools = self._configure_autotools()
+            autotools = Autotools(self)
+            autotools.configure()
+            # With optimizations (PGO) and/or enable_bolt, the default target also runs the training workload
             autotools.make()
 
     @property
@@ -433,43 +510,42 @@ class CPythonConan(ConanFile):
             "x86_64": "amd64",
             "x86": "win32",
         }
-        if tools.Version(self._version_number_only) >= "3.8":
+        if Version(self._version_number_only) >= "3.8":
             build_subdir_lut.update({
                 "armv7": "arm32",
                 "armv8_32": "arm32",
                 "armv8": "arm64",
             })
-        return os.path.join(self._source_subfolder, "PCbuild", build_subdir_lut[str(self.settings.arch)])
+        return os.path.join(self.source_folder, "PCbuild", build_subdir_lut[str(self.settings.arch)])
 
     @property
     def _msvc_install_subprefix(self):
         return "bin"
 
     def _copy_essential_dlls(self):
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             # Until MSVC builds support cross building, copy dll's of essential (shared) dependencies to python binary location.
             # These dll's are required when running the layout tool using the newly built python executable.
-            dest_path = os.path.join(self.build_folder, self._msvc_artifacts_path)
+            dest_path = self._msvc_artifacts_path
+            essential_deps = ["expat", "zlib"]
             if self._with_libffi:
-                for bin_path in self.deps_cpp_info["libffi"].bin_paths:
-                    self.copy("*.dll", src=bin_path, dst=dest_path)
-            for bin_path in self.deps_cpp_info["expat"].bin_paths:
-                self.copy("*.dll", src=bin_path, dst=dest_path)
-            for bin_path in self.deps_cpp_info["zlib"].bin_paths:
-                self.copy("*.dll", src=bin_path, dst=dest_path)
+                essential_deps.append("libffi")
+            for dep in essential_deps:
+                for bin_path in self.dependencies[dep].cpp_info.aggregated_components().bindirs:
+                    copy(self, "*.dll", src=bin_path, dst=dest_path)
 
     def _msvc_package_layout(self):
         self._copy_essential_dlls()
         install_prefix = os.path.join(self.package_folder, self._msvc_install_subprefix)
-        tools.mkdir(install_prefix)
+        mkdir(self, install_prefix)
         build_path = self._msvc_artifacts_path
         infix = "_d" if self.settings.build_type == "Debug" else ""
         # FIXME: if cross building, use a build python executable here
         python_built = os.path.join(build_path, "python{}.exe".format(infix))
         layout_args = [
-            os.path.join(self._source_subfolder, "PC", "layout", "main.py"),
+            os.path.join(self.source_folder, "PC", "layout", "main.py"),
             "-v",
-            "-s", self._source_subfolder,
+            "-s", self.source_folder,
             "-b", build_path,
             "--copy", install_prefix,
             "-p",
@@ -482,9 +558,9 @@ class CPythonConan(ConanFile):
         if self.settings.build_type == "Debug":
             layout_args.append("-d")
         python_args = " ".join("\"{}\"".format(a) for a in layout_args)
-        self.run("{} {}".format(python_built, python_args), run_environment=True)
+        self.run("{} {}".format(python_built, python_args))
 
-        tools.rmdir(os.path.join(self.package_folder, "bin", "tcl"))
+        rmdir(self, os.path.join(self.package_folder, "bin", "tcl"))
 
         for file in os.listdir(install_prefix):
             if re.match("vcruntime.*", file):
@@ -498,45 +574,45 @@ class CPythonConan(ConanFile):
     def _msvc_package_copy(self):
         build_path = self._msvc_artifacts_path
         infix = "_d" if self.settings.build_type == "Debug" else ""
-        self.copy("*.exe", src=build_path, dst=os.path.join(self.package_folder, self._msvc_install_subprefix))
-        self.copy("*.dll", src=build_path, dst=os.path.join(self.package_folder, self._msvc_install_subprefix))
-        self.copy("*.pyd", src=build_path, dst=os.path.join(self.package_folder, self._msvc_install_subprefix, "DLLs"))
-        self.copy("python{}{}.lib".format(self._version_suffix, infix), src=build_path, dst=os.path.join(self.package_folder, self._msvc_install_subprefix, "libs"))
-        self.copy("*", src=os.path.join(self._source_subfolder, "Include"), dst=os.path.join(self.package_folder, self._msvc_install_subprefix, "include"))
-        self.copy("pyconfig.h", src=os.path.join(self._source_subfolder, "PC"), dst=os.path.join(self.package_folder, self._msvc_install_subprefix, "include"))
-        self.copy("*.py", src=os.path.join(self._source_subfolder, "lib"), dst=os.path.join(self.package_folder, self._msvc_install_subprefix, "Lib"))
-        tools.rmdir(os.path.join(self.package_folder, self._msvc_install_subprefix, "Lib", "test"))
+        install_prefix = os.path.join(self.package_folder, self._msvc_install_subprefix)
+        copy(self, "*.exe", src=build_path, dst=install_prefix, keep_path=False)
+        copy(self, "*.dll", src=build_path, dst=install_prefix, keep_path=False)
+        copy(self, "*.pyd", src=build_path, dst=os.path.join(install_prefix, "DLLs"), keep_path=False)
+        copy(self, "python{}{}.lib".format(self._version_suffix, infix), src=build_path, dst=os.path.join(install_prefix, "libs"), keep_path=False)
+        copy(self, "*", src=os.path.join(self.source_folder, "Include"), dst=os.path.join(install_prefix, "include"))
+        copy(self, "pyconfig.h", src=os.path.join(self.source_folder, "PC"), dst=os.path.join(install_prefix, "include"))
+        copy(self, "*.py", src=os.path.join(self.source_folder, "lib"), dst=os.path.join(install_prefix, "Lib"))
+        rmdir(self, os.path.join(install_prefix, "Lib", "test"))
 
         packages = {}
         get_name_version = lambda fn: fn.split(".", 2)[:2]
-        whldir = os.path.join(self._source_subfolder, "Lib", "ensurepip", "_bundled")
+        whldir = os.path.join(self.source_folder, "Lib", "ensurepip", "_bundled")
         for fn in filter(lambda n: n.endswith(".whl"), os.listdir(whldir)):
             name, version = get_name_version(fn)
             add = True
             if name in packages:
                 pname, pversion = get_name_version(packages[name])
-                add = tools.Version(version) > tools.Version(pversion)
+                add = Version(version) > Version(pversion)
             if add:
                 packages[name] = fn
         for fname in packages.values():
-            tools.unzip(filename=os.path.join(whldir, fname), destination=os.path.join(self.package_folder, "bin", "Lib", "site-packages"))
+            unzip(self, filename=os.path.join(whldir, fname), destination=os.path.join(self.package_folder, "bin", "Lib", "site-packages"))
 
-        self.run("{} -c \"import compileall; compileall.compile_dir('{}')\"".format(os.path.join(build_path, self._cpython_interpreter_name), os.path.join(self.package_folder, self._msvc_install_subprefix, "Lib").replace("\\", "/")),
-                 run_environment=True)
+        self.run("{} -c \"import compileall; compileall.compile_dir('{}')\"".format(os.path.join(build_path, self._cpython_interpreter_name), os.path.join(install_prefix, "Lib").replace("\\", "/")))
 
     def package(self):
-        self.copy("LICENSE", src=self._source_subfolder, dst="licenses")
-        if self.settings.compiler == "Visual Studio":
+        copy(self, "LICENSE", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
+        if is_msvc(self):
             if self._is_py2 or not self.options.shared:
                 self._msvc_package_copy()
             else:
                 self._msvc_package_layout()
-            tools.remove_files_by_mask(os.path.join(self.package_folder, "bin"), "vcruntime*")
+            rm(self, "vcruntime*", os.path.join(self.package_folder, "bin"))
         else:
-            autotools = self._configure_autotools()
+            autotools = Autotools(self)
             autotools.install()
-            tools.rmdir(os.path.join(self.package_folder, "lib", "pkgconfig"))
-            tools.rmdir(os.path.join(self.package_folder, "share"))
+            rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
+            rmdir(self, os.path.join(self.package_folder, "share"))
 
             # Rewrite shebangs of python scripts
             for filename in os.listdir(os.path.join(self.package_folder, "bin")):
@@ -577,12 +653,12 @@ class CPythonConan(ConanFile):
 
     @property
     def _cpython_interpreter_name(self):
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             suffix = ""
         else:
             suffix = self._version_suffix
         python = "python{}".format(suffix)
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             if self.settings.build_type == "Debug":
                 python += "_d"
         if self.settings.os == "Windows":
@@ -599,14 +675,14 @@ class CPythonConan(ConanFile):
         if self._is_py3:
             if self.settings.build_type == "Debug":
                 res += "d"
-            if tools.Version(self._version_number_only) < "3.8":
+            if Version(self._version_number_only) < "3.8":
                 if self.options.get_safe("pymalloc", False):
                     res += "m"
         return res
 
     @property
     def _lib_name(self):
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             if self.settings.build_type == "Debug":
                 lib_ext = "_d"
             else:
@@ -616,10 +692,10 @@ class CPythonConan(ConanFile):
         return "python{}{}".format(self._version_suffix, lib_ext)
 
     def _fix_install_name(self):
-        if tools.is_apple_os(self.settings.os) and self.options.shared:
+        if is_apple_os(self) and self.options.shared:
             buffer = StringIO()
             python = os.path.join(self.package_folder, "bin", "python")
-            self.run('otool -L "%s"' % python, output=buffer)
+            self.run('otool -L "%s"' % python, buffer)
             lines = buffer.getvalue().strip().split('\n')[1:]
             for line in lines:
                 library = line.split()[0]
@@ -634,9 +710,9 @@ class CPythonConan(ConanFile):
         # self.cpp_info.names["cmake_find_package_multi"] = "Python"
         # FIXME: conan components need to generate multiple .pc files (python2, python-27)
 
-        py_version = tools.Version(self._version_number_only)
+        py_version = Version(self._version_number_only)
         # python component: "Build a C extension for Python"
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             self.cpp_info.components["python"].includedirs = [os.path.join(self._msvc_install_subprefix, "include")]
             libdir = os.path.join(self._msvc_install_subprefix, "libs")
         else:
@@ -653,21 +729,21 @@ class CPythonConan(ConanFile):
         self.cpp_info.components["python"].requires = ["zlib::zlib"]
         if self.settings.os != "Windows":
             self.cpp_info.components["python"].requires.append("libxcrypt::libxcrypt")
-        self.cpp_info.components["python"].names["pkg_config"] = "python-{}.{}".format(py_version.major, py_version.minor)
+        self.cpp_info.components["python"].set_property("pkg_config_name", "python-{}.{}".format(py_version.major, py_version.minor))
         self.cpp_info.components["python"].libdirs = []
 
-        self.cpp_info.components["_python_copy"].names["pkg_config"] = "python{}".format(py_version.major)
+        self.cpp_info.components["_python_copy"].set_property("pkg_config_name", "python{}".format(py_version.major))
         self.cpp_info.components["_python_copy"].requires = ["python"]
         self.cpp_info.components["_python_copy"].libdirs = []
 
         # embed component: "Embed Python into an application"
         self.cpp_info.components["embed"].libs = [self._lib_name]
         self.cpp_info.components["embed"].libdirs = [libdir]
-        self.cpp_info.components["embed"].names["pkg_config"] = "python-{}.{}-embed".format(py_version.major, py_version.minor)
+        self.cpp_info.components["embed"].set_property("pkg_config_name", "python-{}.{}-embed".format(py_version.major, py_version.minor))
         self.cpp_info.components["embed"].requires = ["python"]
 
         self.cpp_info.components["_embed_copy"].requires = ["embed"]
-        self.cpp_info.components["_embed_copy"].names["pkg_config"] = ["python{}-embed".format(py_version.major)]
+        self.cpp_info.components["_embed_copy"].set_property("pkg_config_name", "python{}-embed".format(py_version.major))
         self.cpp_info.components["_embed_copy"].libdirs = []
 
         if self._supports_modules:
@@ -681,7 +757,7 @@ class CPythonConan(ConanFile):
             if self._with_libffi:
                 self.cpp_info.components["_hidden"].requires.append("libffi::libffi")
             if self.settings.os != "Windows":
-                if not tools.is_apple_os(self.settings.os):
+                if not is_apple_os(self):
                     self.cpp_info.components["_hidden"].requires.append("libuuid::libuuid")
                 self.cpp_info.components["_hidden"].requires.append("libxcrypt::libxcrypt")
             if self.options.with_bz2:
@@ -700,39 +776,45 @@ class CPythonConan(ConanFile):
                 self.cpp_info.components["_hidden"].requires.append("tk::tk")
             self.cpp_info.components["_hidden"].libdirs = []
 
+        bindir = os.path.join(self.package_folder, "bin")
+        python = self._cpython_interpreter_path
+        if is_msvc(self):
+            pythonhome = os.path.join(self.package_folder, "bin")
+        elif is_apple_os(self):
+            pythonhome = self.package_folder
+        else:
+            pythonhome = os.path.join(self.package_folder, "lib", "python{}.{}".format(py_version.major, py_version.minor))
+        pythonhome_required = is_msvc(self) or is_apple_os(self)
+        python_root = "" if self._is_py2 else self.package_folder
+
+        self.conf_info.define("user.cpython:python", python)
+        self.conf_info.define("user.cpython:pythonhome", pythonhome)
+        self.conf_info.define("user.cpython:module_requires_pythonhome", pythonhome_required)
+        self.conf_info.define("user.cpython:python_root", python_root)
+        if self.options.env_vars:
+            for env in (self.buildenv_info, self.runenv_info):
+                env.define_path("PYTHON", python)
+                if is_msvc(self):
+                    env.define_path("PYTHONHOME", pythonhome)
+                if python_root:
+                    env.define_path("PYTHON_ROOT", python_root)
+
+        # TODO: to remove in conan v2
         if self.options.env_vars:
-            bindir = os.path.join(self.package_folder, "bin")
             self.output.info("Appending PATH environment variable: {}".format(bindir))
             self.env_info.PATH.append(bindir)
 
-        python = self._cpython_interpreter_path
         self.user_info.python = python
         if self.options.env_vars:
             self.output.info("Setting PYTHON environment variable: {}".format(python))
             self.env_info.PYTHON = python
-
-        if self.settings.compiler == "Visual Studio":
-            pythonhome = os.path.join(self.package_folder, "bin")
-        elif tools.is_apple_os(self.settings.os):
-            pythonhome = self.package_folder
-        else:
-            version = tools.Version(self._version_number_only)
-            pythonhome = os.path.join(self.package_folder, "lib", "python{}.{}".format(version.major, version.minor))
         self.user_info.pythonhome = pythonhome
-
-        pythonhome_required = self.settings.compiler == "Visual Studio" or tools.is_apple_os(self.settings.os)
         self.user_info.module_requires_pythonhome = pythonhome_required
-
-        if self.settings.compiler == "Visual Studio":
+        if is_msvc(self):
             if self.options.env_vars:
                 self.output.info("Setting PYTHONHOME environment variable: {}".format(pythonhome))
                 self.env_info.PYTHONHOME = pythonhome
-
-        if self._is_py2:
-            python_root = ""
-        else:
-            python_root = self.package_folder
-            if self.options.env_vars:
-                self.output.info("Setting PYTHON_ROOT environment variable: {}".format(python_root))
-                self.env_info.PYTHON_ROOT = python_root
+        if python_root and self.options.env_vars:
+            self.output.info("Setting PYTHON_ROOT environment variable: {}".format(python_root))
+            self.env_info.PYTHON_ROOT = python_root
         self.user_info.python_root = python_root
@@ -0,0 +1,10 @@
+#include <Python.h>
+
+int main(void)
+{
+    Py_Initialize();
+    PyRun_SimpleString("import sys\n"
+                       "print('Embedded python ' + sys.version)\n");
+    Py_Finalize();
+    return 0;
+}
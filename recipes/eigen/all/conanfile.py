@@ -1,6 +1,8 @@
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
 from conan.tools.cmake import CMake, cmake_layout, CMakeToolchain
 from conan.tools.files import apply_conandata_patches, export_conandata_patches, copy, get, rmdir
+from conan.tools.microsoft import is_msvc
 import os
 
 required_conan_version = ">=1.52.0"
@@ -19,9 +21,17 @@ class EigenConan(ConanFile):
     settings = "os", "arch", "compiler", "build_type"
     options = {
         "MPL2_only": [True, False],
+        "with_blas": [True, False],
+        "with_lapacke": [True, False],
+        "with_openmp": [True, False],
+        "use_threads": [True, False],
     }
     default_options = {
         "MPL2_only": False,
+        "with_blas": False,
+        "with_lapacke": False,
+        "with_openmp": False,
+        "use_threads": False,
     }
 
     def export_sources(self):
@@ -33,9 +43,19 @@ class EigenConan(ConanFile):
     def layout(self):
         cmake_layout(self, src_folder="src")
 
+    def requirements(self):
+        if self.options.with_blas or self.options.with_lapacke:
+            self.requires("openblas/0.3.20")
+        if self.options.with_openmp and self.settings.compiler in ("clang", "apple-clang"):
+            self.requires("llvm-openmp/12.0.1")
+
     def package_id(self):
         self.info.clear()
 
+    def validate(self):
+        if self.options.with_lapacke and not self.dependencies["openblas"].options.build_lapack:
+            raise ConanInvalidConfiguration(f"{self.ref} option with_lapacke=True requires openblas:build_lapack=True")
+
     def source(self):
         get(self, **self.conan_data["sources"][self.version],
             destination=self.source_folder, strip_root=True)
@@ -67,9 +87,31 @@ class EigenConan(ConanFile):
         self.cpp_info.components["eigen3"].bindirs = []
         self.cpp_info.components["eigen3"].libdirs = []
         if self.settings.os in ["Linux", "FreeBSD"]:
-            self.cpp_info.components["eigen3"].system_libs = ["m"]
+            self.cpp_info.components["eigen3"].system_libs.append("m")
         if self.options.MPL2_only:
-            self.cpp_info.components["eigen3"].defines = ["EIGEN_MPL2_ONLY"]
+            self.cpp_info.components["eigen3"].defines.append("EIGEN_MPL2_ONLY")
+        if self.options.with_blas:
+            self.cpp_info.components["eigen3"].defines.append("EIGEN_USE_BLAS")
+        if self.options.with_lapacke:
+            self.cpp_info.components["eigen3"].defines.append("EIGEN_USE_LAPACKE")
+        if self.options.with_blas or self.options.with_lapacke:
+            self.cpp_info.components["eigen3"].requires.append("openblas::openblas_component")
+        if self.options.use_threads:
+            # ThreadPoolDevice of the Tensor module
+            self.cpp_info.components["eigen3"].defines.append("EIGEN_USE_THREADS")
+            if self.settings.os in ["Linux", "FreeBSD"]:
+                self.cpp_info.components["eigen3"].system_libs.append("pthread")
+        if self.options.with_openmp:
+            # Eigen parallelizes its products with OpenMP when it is enabled while compiling the consumers
+            if self.settings.compiler in ("clang", "apple-clang"):
+                self.cpp_info.components["eigen3"].requires.append("llvm-openmp::llvm-openmp")
+            elif is_msvc(self):
+                # the objects built with /openmp reference vcomp, nothing to add at link time
+                self.cpp_info.components["eigen3"].cxxflags.append("/openmp")
+            elif self.settings.compiler == "gcc":
+                self.cpp_info.components["eigen3"].cxxflags.append("-fopenmp")
+                self.cpp_info.components["eigen3"].exelinkflags.append("-fopenmp")
+                self.cpp_info.components["eigen3"].sharedlinkflags.append("-fopenmp")
 
         # TODO: to remove in conan v2 once cmake_find_package* & pkg_config generators removed
         self.cpp_info.names["cmake_find_package"] = "Eigen3"
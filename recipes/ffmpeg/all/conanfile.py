@@ -55,6 +55,9 @@ class FFMpegConan(ConanFile):
         "with_libx264": [True, False],
         "with_libx265": [True, False],
         "with_libvpx": [True, False],
+        "with_dav1d": [True, False],
+        "with_libsvtav1": [True, False],
+        "with_libaom": [True, False],
         "with_libmp3lame": [True, False],
         "with_libfdk_aac": [True, False],
         "with_libwebp": [True, False],
@@ -132,6 +135,9 @@ class FFMpegConan(ConanFile):
         "with_libx264": True,
         "with_libx265": True,
         "with_libvpx": True,
+        "with_dav1d": False,
+        "with_libsvtav1": False,
+        "with_libaom": False,
         "with_libmp3lame": True,
         "with_libfdk_aac": True,
         "with_libwebp": True,
@@ -207,6 +213,9 @@ class FFMpegConan(ConanFile):
             "with_libx264": ["avcodec"],
             "with_libx265": ["avcodec"],
             "with_libvpx": ["avcodec"],
+            "with_dav1d": ["avcodec"],
+            "with_libsvtav1": ["avcodec"],
+            "with_libaom": ["avcodec"],
             "with_libmp3lame": ["avcodec"],
             "with_libfdk_aac": ["avcodec"],
             "with_libwebp": ["avcodec"],
@@ -222,6 +231,11 @@ class FFMpegConan(ConanFile):
     def _version_supports_vulkan(self):
         return Version(self.version) >= "4.3.0"
 
+    @property
+    def _version_supports_libsvtav1(self):
+        # older libsvtav1 wrappers don't build against SVT-AV1 1.x
+        return Version(self.version) >= "5.1"
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -245,6 +259,8 @@ class FFMpegConan(ConanFile):
             del self.options.with_avfoundation
         if not self._version_supports_vulkan:
             self.options.rm_safe("with_vulkan")
+        if not self._version_supports_libsvtav1:
+            del self.options.with_libsvtav1
 
     def configure(self):
         if self.options.shared:
@@ -284,6 +300,13 @@ class FFMpegConan(ConanFile):
             self.requires("libx265/3.4")
         if self.options.with_libvpx:
             self.requires("libvpx/1.11.0")
+        if self.options.with_dav1d:
+            # dav1d 1.0 replaced the frame/tile threads settings, only supported from FFmpeg 5.0
+            self.requires("dav1d/1.1.0" if Version(self.version) >= "5.0" else "dav1d/0.9.1")
+        if self.options.get_safe("with_libsvtav1"):
+            self.requires("libsvtav1/1.4.1")
+        if self.options.with_libaom:
+            self.requires("libaom-av1/3.6.0")
         if self.options.with_libmp3lame:
             self.requires("libmp3lame/3.100")
         if self.options.with_libfdk_aac:
@@ -320,6 +343,9 @@ class FFMpegConan(ConanFile):
                 raise ConanInvalidConfiguration("FFmpeg '{}' option requires '{}' option to be enabled".format(
                     dependency, "' or '".join(features)))
 
+        if self.options.get_safe("with_libsvtav1") and not self.dependencies["libsvtav1"].options.build_encoder:
+            raise ConanInvalidConfiguration("FFmpeg 'with_libsvtav1' option requires 'libsvtav1:build_encoder' to be enabled")
+
     def build_requirements(self):
         if self.settings.arch in ("x86", "x86_64"):
             self.tool_requires("yasm/1.3.0")
@@ -457,6 +483,8 @@ class FFMpegConan(ConanFile):
             opt_enable_disable("libx264", self.options.with_libx264),
             opt_enable_disable("libx265", self.options.with_libx265),
             opt_enable_disable("libvpx", self.options.with_libvpx),
+            opt_enable_disable("libdav1d", self.options.with_dav1d),
+            opt_enable_disable("libaom", self.options.with_libaom),
             opt_enable_disable("libmp3lame", self.options.with_libmp3lame),
             opt_enable_disable("libfdk-aac", self.options.with_libfdk_aac),
             opt_enable_disable("libwebp", self.options.with_libwebp),
@@ -555,6 +583,8 @@ class FFMpegConan(ConanFile):
 
         if self._version_supports_vulkan:
             args.append(opt_enable_disable("vulkan", self.options.get_safe("with_vulkan")))
+        if self._version_supports_libsvtav1:
+            args.append(opt_enable_disable("libsvtav1", self.options.get_safe("with_libsvtav1")))
         if is_apple_os(self):
             # relocatable shared libs
             args.append("--install-name-dir=@rpath")
@@ -922,6 +952,15 @@ class FFMpegConan(ConanFile):
             if self.options.with_libvpx:
                 self.cpp_info.components["avcodec"].requires.append(
                     "libvpx::libvpx")
+            if self.options.with_dav1d:
+                self.cpp_info.components["avcodec"].requires.append(
+                    "dav1d::dav1d")
+            if self.options.get_safe("with_libsvtav1"):
+                self.cpp_info.components["avcodec"].requires.append(
+                    "libsvtav1::encoder")
+            if self.options.with_libaom:
+                self.cpp_info.components["avcodec"].requires.append(
+                    "libaom-av1::libaom-av1")
             if self.options.with_libmp3lame:
                 self.cpp_info.components["avcodec"].requires.append(
                     "libmp3lame::libmp3lame")
@@ -36,6 +36,13 @@ class FFTWConan(ConanFile):
         "simd": False,
     }
 
+    @property
+    def _simd_by_x86_64_level(self):
+        if self.options.precision == "longdouble":
+            # SIMD kernels are only available in single and double precision
+            return {"x86-64": False, "x86-64-v2": False, "x86-64-v3": False, "x86-64-v4": False}
+        return {"x86-64": "sse2", "x86-64-v2": "sse2", "x86-64-v3": "avx2", "x86-64-v4": "avx2"}
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -50,6 +57,10 @@ class FFTWConan(ConanFile):
         self.settings.rm_safe("compiler.libcxx")
         if not self.options.threads:
             del self.options.combinedthreads
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._simd_by_x86_64_level and \
+           self.options.simd == self.default_options["simd"]:
+            self.options.simd = self._simd_by_x86_64_level[x86_64_level]
 
     def layout(self):
         cmake_layout(self, src_folder="src")
@@ -60,6 +71,12 @@ class FFTWConan(ConanFile):
                 raise ConanInvalidConfiguration("Shared fftw with openmp can't be built on Windows")
             if self.options.threads and not self.options.combinedthreads:
                 raise ConanInvalidConfiguration("Shared fftw with threads and not combinedthreads can't be built on Windows")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and \
+           str(self.options.simd) != str(self._simd_by_x86_64_level.get(x86_64_level)):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: simd={self.options.simd} does not match user.cci:x86_64_level={x86_64_level}"
+            )
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
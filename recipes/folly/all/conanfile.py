@@ -8,7 +8,7 @@ from conan.errors import ConanInvalidConfiguration
 import functools
 import os
 
-required_conan_version = ">=1.45.0"
+required_conan_version = ">=1.53.0"
 
 
 class FollyConan(ConanFile):
@@ -24,11 +24,17 @@ class FollyConan(ConanFile):
         "shared": [True, False],
         "fPIC": [True, False],
         "use_sse4_2" : [True, False],
+        "with_jemalloc": [True, False],
+        "with_liburing": [True, False],
+        "with_libaio": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
-        "use_sse4_2" : False
+        "use_sse4_2" : False,
+        "with_jemalloc": False,
+        "with_liburing": False,
+        "with_libaio": False,
     }
 
     generators = "cmake", "cmake_find_package"
@@ -55,6 +61,10 @@ class FollyConan(ConanFile):
             "apple-clang": "10",
         }
 
+    @property
+    def _use_sse4_2_by_x86_64_level(self):
+        return {"x86-64": False, "x86-64-v2": True, "x86-64-v3": True, "x86-64-v4": True}
+
     def export_sources(self):
         self.copy("CMakeLists.txt")
         for patch in self.conan_data.get("patches", {}).get(self.version, []):
@@ -68,9 +78,18 @@ class FollyConan(ConanFile):
         if str(self.settings.arch) not in ['x86', 'x86_64']:
             del self.options.use_sse4_2
 
+        # AsyncIO and IoUring backends of folly/experimental/io
+        if self.settings.os != "Linux" or Version(self.version) < "2020.08.10.00":
+            del self.options.with_liburing
+            del self.options.with_libaio
+
     def configure(self):
         if self.options.shared:
             del self.options.fPIC
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._use_sse4_2_by_x86_64_level and \
+           self.options.use_sse4_2 == self.default_options["use_sse4_2"]:
+            self.options.use_sse4_2 = self._use_sse4_2_by_x86_64_level[x86_64_level]
 
     def requirements(self):
         self.requires("boost/1.78.0")
@@ -88,7 +107,12 @@ class FollyConan(ConanFile):
             self.requires("libdwarf/20191104")
         self.requires("libsodium/1.0.18")
         self.requires("xz_utils/5.2.5")
-        # FIXME: Causing compilation issues on clang: self.requires("jemalloc/5.2.1")
+        if self.options.with_jemalloc:
+            self.requires("jemalloc/5.3.0")
+        if self.options.get_safe("with_liburing"):
+            self.requires("liburing/2.2")
+        if self.options.get_safe("with_libaio"):
+            self.requires("libaio/0.3.113")
         if self.settings.os == "Linux":
             self.requires("libiberty/9.1.0")
             self.requires("libunwind/1.5.0")
@@ -119,9 +143,20 @@ class FollyConan(ConanFile):
         if self.settings.os == "Windows" and self.settings.arch != "x86_64":
             raise ConanInvalidConfiguration("Folly requires a 64bit target architecture on Windows")
 
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and \
+           str(self.options.use_sse4_2) != str(self._use_sse4_2_by_x86_64_level.get(x86_64_level)):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: use_sse4_2={self.options.use_sse4_2} does not match user.cci:x86_64_level={x86_64_level}"
+            )
+
         if self.settings.os in ["Macos", "Windows"] and self.options.shared:
             raise ConanInvalidConfiguration("Folly could not be built on {} as shared library".format(self.settings.os))
 
+        if self.options.with_jemalloc and self.settings.compiler == "clang":
+            # FIXME: the jemalloc headers included by folly/portability/Malloc.h cause compilation issues with clang
+            raise ConanInvalidConfiguration(f"{self.ref} option with_jemalloc=True is not supported with clang")
+
         if Version(self.version) == "2020.08.10.00" and self.settings.compiler == "clang" and self.options.shared:
             raise ConanInvalidConfiguration("Folly could not be built by clang as a shared library")
 
@@ -174,6 +209,13 @@ class FollyConan(ConanFile):
 
         cmake.definitions["CMAKE_POSITION_INDEPENDENT_CODE"] = self.options.get_safe("fPIC", True)
 
+        # Only use the optional dependencies provided by Conan, never the ones installed on the build machine
+        cmake.definitions["CMAKE_DISABLE_FIND_PACKAGE_LibUring"] = not self.options.get_safe("with_liburing", False)
+        cmake.definitions["CMAKE_DISABLE_FIND_PACKAGE_LibAIO"] = not self.options.get_safe("with_libaio", False)
+        cmake.definitions["CMAKE_DISABLE_FIND_PACKAGE_Jemalloc"] = not self.options.with_jemalloc
+        # Read by CMakeLists.txt of the wrapper: folly/portability/Malloc.h checks this preprocessor definition
+        cmake.definitions["FOLLY_USE_JEMALLOC"] = self.options.with_jemalloc
+
         cxx_std_flag = tools.cppstd_flag(self.settings)
         cxx_std_value = cxx_std_flag.split('=')[1] if cxx_std_flag else "c++{}".format(self._minimum_cpp_standard)
         cmake.definitions["CXX_STD"] = cxx_std_value
@@ -244,6 +286,14 @@ class FollyConan(ConanFile):
         ]
         if not is_msvc(self):
             self.cpp_info.components["libfolly"].requires.append("libdwarf::libdwarf")
+        if self.options.with_jemalloc:
+            # folly detects jemalloc at runtime (usingJEMalloc) to use its sized deallocation
+            self.cpp_info.components["libfolly"].requires.append("jemalloc::jemalloc")
+            self.cpp_info.components["libfolly"].defines.append("FOLLY_USE_JEMALLOC")
+        if self.options.get_safe("with_liburing"):
+            self.cpp_info.components["libfolly"].requires.append("liburing::liburing")
+        if self.options.get_safe("with_libaio"):
+            self.cpp_info.components["libfolly"].requires.append("libaio::libaio")
         if self.settings.os == "Linux":
             self.cpp_info.components["libfolly"].requires.extend(["libiberty::libiberty", "libunwind::libunwind"])
             self.cpp_info.components["libfolly"].system_libs.extend(["pthread", "dl", "rt"])
@@ -266,7 +316,7 @@ class FollyConan(ConanFile):
             self.cpp_info.components["libfolly"].system_libs.append("c++abi")
 
         if self.options.get_safe("use_sse4_2") and str(self.settings.arch) in ['x86', 'x86_64']:
-            self.cpp_info.components["libfolly"].defines = ["FOLLY_SSE=4", "FOLLY_SSE_MINOR=2"]
+            self.cpp_info.components["libfolly"].defines.extend(["FOLLY_SSE=4", "FOLLY_SSE_MINOR=2"])
 
         # TODO: to remove in conan v2 once cmake_find_package_* & pkg_config generators removed
         self.cpp_info.filenames["cmake_find_package"] = "folly"
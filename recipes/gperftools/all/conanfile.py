@@ -0,0 +1,130 @@
+from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
+from conan.tools.apple import fix_apple_shared_install_name
+from conan.tools.build import check_min_cppstd, stdcpp_library
+from conan.tools.env import VirtualBuildEnv
+from conan.tools.files import copy, get, rm, rmdir
+from conan.tools.gnu import Autotools, AutotoolsDeps, AutotoolsToolchain
+from conan.tools.layout import basic_layout
+import os
+
+required_conan_version = ">=1.54.0"
+
+
+class GperftoolsConan(ConanFile):
+    name = "gperftools"
+    description = "High-performance multi-threaded malloc() implementation (tcmalloc), plus heap checker, heap profiler and CPU profiler"
+    license = "BSD-3-Clause"
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "https://github.com/gperftools/gperftools"
+    topics = ("tcmalloc", "malloc", "allocator", "profiler", "pprof")
+    package_type = "library"
+    settings = "os", "arch", "compiler", "build_type"
+    options = {
+        "shared": [True, False],
+        "fPIC": [True, False],
+        "with_libunwind": [True, False],
+        "tcmalloc_pagesize": [8, 32, 64, 128, 256],
+        "tcmalloc_alignment": [8, 16],
+        "enable_sized_delete": [True, False],
+    }
+    default_options = {
+        "shared": False,
+        "fPIC": True,
+        "with_libunwind": True,
+        "tcmalloc_pagesize": 8,
+        "tcmalloc_alignment": 16,
+        "enable_sized_delete": False,
+    }
+
+    @property
+    def _min_cppstd(self):
+        return 17
+
+    def config_options(self):
+        if self.settings.os == "Windows":
+            del self.options.fPIC
+        if self.settings.os not in ["Linux", "FreeBSD"]:
+            # libunwind recipe is only available on Linux and FreeBSD, the frame pointers are used instead
+            del self.options.with_libunwind
+
+    def configure(self):
+        if self.options.shared:
+            self.options.rm_safe("fPIC")
+
+    def layout(self):
+        basic_layout(self, src_folder="src")
+
+    def requirements(self):
+        if self.options.get_safe("with_libunwind"):
+            self.requires("libunwind/1.6.2")
+
+    def validate(self):
+        if self.settings.compiler.get_safe("cppstd"):
+            check_min_cppstd(self, self._min_cppstd)
+        if self.settings.os not in ["Linux", "FreeBSD", "Macos"]:
+            raise ConanInvalidConfiguration(f"{self.ref} recipe only supports Linux, FreeBSD and Macos")
+
+    def source(self):
+        get(self, **self.conan_data["sources"][self.version], strip_root=True)
+
+    def generate(self):
+        env = VirtualBuildEnv(self)
+        env.generate()
+
+        tc = AutotoolsToolchain(self)
+        yes_no = lambda v: "yes" if v else "no"
+        tc.configure_args.extend([
+            f"--enable-libunwind={yes_no(self.options.get_safe('with_libunwind'))}",
+            f"--enable-frame-pointers={yes_no(not self.options.get_safe('with_libunwind'))}",
+            f"--with-tcmalloc-pagesize={self.options.tcmalloc_pagesize}",
+            f"--with-tcmalloc-alignment={self.options.tcmalloc_alignment}",
+            f"--enable-sized-delete={yes_no(self.options.enable_sized_delete)}",
+            # tcmalloc_debug and tcmalloc_minimal_debug are not packaged
+            "--disable-debugalloc",
+        ])
+        tc.generate()
+
+        deps = AutotoolsDeps(self)
+        deps.generate()
+
+    def build(self):
+        autotools = Autotools(self)
+        autotools.configure()
+        autotools.make()
+
+    def package(self):
+        copy(self, "COPYING", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
+        autotools = Autotools(self)
+        autotools.install()
+        rm(self, "*.la", os.path.join(self.package_folder, "lib"))
+        rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
+        rmdir(self, os.path.join(self.package_folder, "share"))
+        fix_apple_shared_install_name(self)
+
+    def package_info(self):
+        self.cpp_info.set_property("cmake_file_name", "gperftools")
+
+        def _add_component(name, pkg_config_name, with_unwind):
+            component = self.cpp_info.components[name]
+            component.set_property("cmake_target_name", f"gperftools::{name}")
+            if pkg_config_name:
+                component.set_property("pkg_config_name", pkg_config_name)
+            component.libs = [name]
+            if with_unwind and self.options.get_safe("with_libunwind"):
+                component.requires.append("libunwind::unwind")
+            if self.settings.os in ["Linux", "FreeBSD"]:
+                component.system_libs.extend(["m", "pthread"])
+            if not self.options.shared:
+                libcxx = stdcpp_library(self)
+                if libcxx:
+                    component.system_libs.append(libcxx)
+
+        # Allocator without the heap checker and the heap profiler, it does not unwind stacks
+        _add_component("tcmalloc_minimal", "libtcmalloc_minimal", with_unwind=False)
+        _add_component("tcmalloc", "libtcmalloc", with_unwind=True)
+        _add_component("profiler", "libprofiler", with_unwind=True)
+        _add_component("tcmalloc_and_profiler", None, with_unwind=True)
+
+        # TODO: to remove in conan v2, pprof script used to read the profiles
+        self.env_info.PATH.append(os.path.join(self.package_folder, "bin"))
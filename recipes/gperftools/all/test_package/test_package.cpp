@@ -0,0 +1,25 @@
+#include <gperftools/malloc_extension.h>
+#include <gperftools/profiler.h>
+#include <gperftools/tcmalloc.h>
+
+#include <cstdlib>
+#include <iostream>
+#include <vector>
+
+int main() {
+    std::vector<int> values(1024, 42);
+
+    void *ptr = tc_malloc(256);
+    tc_free(ptr);
+
+    size_t allocated = 0;
+    MallocExtension::instance()->GetNumericProperty("generic.current_allocated_bytes", &allocated);
+    std::cout << "tcmalloc " << tc_version(nullptr, nullptr, nullptr)
+              << ", current allocated bytes: " << allocated << std::endl;
+
+    ProfilerState state;
+    ProfilerGetCurrentState(&state);
+    std::cout << "CPU profiler enabled: " << state.enabled << std::endl;
+
+    return values[0] == 42 ? EXIT_SUCCESS : EXIT_FAILURE;
+}
@@ -42,6 +42,10 @@ class HyperscanConan(ConanFile):
     def _min_cppstd(self):
         return 11
 
+    @property
+    def _build_avx512_by_x86_64_level(self):
+        return {"x86-64": False, "x86-64-v2": False, "x86-64-v3": False, "x86-64-v4": True}
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -52,6 +56,10 @@ class HyperscanConan(ConanFile):
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._build_avx512_by_x86_64_level and \
+           self.options.build_avx512 == self.default_options["build_avx512"]:
+            self.options.build_avx512 = self._build_avx512_by_x86_64_level[x86_64_level]
 
     def layout(self):
         cmake_layout(self, src_folder="src")
@@ -70,6 +78,12 @@ class HyperscanConan(ConanFile):
 
         if self.settings.arch not in ["x86", "x86_64"]:
             raise ConanInvalidConfiguration("Hyperscan only support x86 architecture")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and \
+           str(self.options.build_avx512) != str(self._build_avx512_by_x86_64_level.get(x86_64_level)):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: build_avx512={self.options.build_avx512} does not match user.cci:x86_64_level={x86_64_level}"
+            )
 
     def build_requirements(self):
         self.tool_requires("ragel/6.10")
@@ -6,6 +6,7 @@ from conans import tools as tools_legacy
 from conan.tools.files import apply_conandata_patches, get, rename, replace_in_file
 from conan.tools.layout import basic_layout
 import os
+import re
 import shutil
 import string
 
@@ -33,6 +34,11 @@ class JemallocConan(ConanFile):
         "enable_initial_exec_tls": [True, False],
         "enable_libdl": [True, False],
         "enable_prof": [True, False],
+        "lg_page": [None, "ANY"],
+        "lg_hugepage": [None, "ANY"],
+        "lg_quantum": [None, "ANY"],
+        "background_thread": [True, False],
+        "malloc_conf": [None, "ANY"],
     }
     default_options = {
         "shared": False,
@@ -48,6 +54,11 @@ class JemallocConan(ConanFile):
         "enable_initial_exec_tls": True,
         "enable_libdl": True,
         "enable_prof": False,
+        "lg_page": None,
+        "lg_hugepage": None,
+        "lg_quantum": None,
+        "background_thread": False,
+        "malloc_conf": None,
     }
     exports_sources = ["patches/**"]
 
@@ -85,6 +96,14 @@ class JemallocConan(ConanFile):
             raise ConanInvalidConfiguration("Unsupported compiler version")
         if self.settings.os == "Macos" and self.settings.arch not in ("x86_64", "x86"):
             raise ConanInvalidConfiguration("Unsupported arch")
+        for option in ("lg_page", "lg_hugepage", "lg_quantum"):
+            value = self.options.get_safe(option)
+            if value and not str(value).isdigit():
+                raise ConanInvalidConfiguration(f"{self.ref}: {option} must be the base 2 log of a size in bytes, not '{value}'")
+        if self.options.malloc_conf and not re.fullmatch(r"[\w.:,-]+", str(self.options.malloc_conf)):
+            raise ConanInvalidConfiguration(f"{self.ref}: malloc_conf must be a list of option:value separated by commas")
+        if self.options.background_thread and self.settings.os not in ("Linux", "FreeBSD"):
+            raise ConanInvalidConfiguration(f"{self.ref}: background_thread is only supported on Linux and FreeBSD")
 
     def layout(self):
         basic_layout(self, src_folder="src")
@@ -107,7 +126,7 @@ class JemallocConan(ConanFile):
             "--enable-debug" if self.settings.build_type == "Debug" else "--disable-debug",
             "--enable-cxx" if self.options.enable_cxx else "--disable-cxx",
             "--enable-fill" if self.options.enable_fill else "--disable-fill",
-            "--enable-xmalloc" if self.options.enable_cxx else "--disable-xmalloc",
+            "--enable-xmalloc" if self.options.enable_xmalloc else "--disable-xmalloc",
             "--enable-readlinkat" if self.options.enable_readlinkat else "--disable-readlinkat",
             "--enable-syscall" if self.options.enable_syscall else "--disable-syscall",
             "--enable-lazy-lock" if self.options.enable_lazy_lock else "--disable-lazy-lock",
@@ -117,12 +136,28 @@ class JemallocConan(ConanFile):
         ]
         if self.options.enable_prof:
             conf_args.append("--enable-prof")
+        if self.options.lg_page:
+            conf_args.append(f"--with-lg-page={self.options.lg_page}")
+        if self.options.lg_hugepage:
+            conf_args.append(f"--with-lg-hugepage={self.options.lg_hugepage}")
+        if self.options.lg_quantum:
+            conf_args.append(f"--with-lg-quantum={self.options.lg_quantum}")
+        if self._malloc_conf:
+            # Default run-time options compiled in the library, the MALLOC_CONF environment variable still overrides them
+            conf_args.append(f"--with-malloc-conf={self._malloc_conf}")
         if self.options.shared:
             conf_args.extend(["--enable-shared", "--disable-static"])
         else:
             conf_args.extend(["--disable-shared", "--enable-static"])
         return conf_args
 
+    @property
+    def _malloc_conf(self):
+        malloc_conf = ["background_thread:true"] if self.options.background_thread else []
+        if self.options.malloc_conf:
+            malloc_conf.append(str(self.options.malloc_conf))
+        return ",".join(malloc_conf)
+
     def _configure_autotools(self):
         if self._autotools:
             return self._autotools
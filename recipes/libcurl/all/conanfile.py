@@ -53,6 +53,7 @@ class LibcurlConan(ConanFile):
         "with_libpsl": [True, False],
         "with_largemaxwritesize": [True, False],
         "with_nghttp2": [True, False],
+        "with_ngtcp2": [True, False],
         "with_zlib": [True, False],
         "with_brotli": [True, False],
         "with_zstd": [True, False],
@@ -99,6 +100,7 @@ class LibcurlConan(ConanFile):
         "with_libpsl": False,
         "with_largemaxwritesize": False,
         "with_nghttp2": False,
+        "with_ngtcp2": False,
         "with_zlib": True,
         "with_brotli": False,
         "with_zstd": False,
@@ -158,6 +160,9 @@ class LibcurlConan(ConanFile):
             del self.options.with_libpsl
         if self._is_using_cmake_build:
             del self.options.with_libgsasl
+        # ngtcp2 and nghttp3 API are not stable yet, each curl release supports only a few of their versions
+        if Version(self.version) < "8.0.0":
+            del self.options.with_ngtcp2
 
         # Before 7.86.0, enabling unix sockets configure option would fail on windows
         # It was fixed with this PR: https://github.com/curl/curl/pull/9688
@@ -172,6 +177,10 @@ class LibcurlConan(ConanFile):
             self.options.rm_safe("fPIC")
         self.settings.rm_safe("compiler.libcxx")
         self.settings.rm_safe("compiler.cppstd")
+        if self.options.get_safe("with_ngtcp2"):
+            self.options["ngtcp2"].with_wolfssl = True
+            self.options["wolfssl"].quic = True
+            self.options["wolfssl"].tls13 = True
 
     def layout(self):
         if self._is_using_cmake_build:
@@ -186,6 +195,9 @@ class LibcurlConan(ConanFile):
             self.requires("wolfssl/5.5.1")
         if self.options.with_nghttp2:
             self.requires("libnghttp2/1.51.0")
+        if self.options.get_safe("with_ngtcp2"):
+            self.requires("ngtcp2/0.13.1")
+            self.requires("nghttp3/0.9.0")
         if self.options.with_libssh2:
             self.requires("libssh2/1.10.0")
         if self.options.with_zlib:
@@ -208,6 +220,12 @@ class LibcurlConan(ConanFile):
             openssl = self.dependencies["openssl"]
             if self.options.with_ntlm and openssl.options.no_des:
                 raise ConanInvalidConfiguration("option with_ntlm=True requires openssl:no_des=False")
+        if self.options.get_safe("with_ngtcp2"):
+            # openssl recipe doesn't provide the QUIC API of the quictls fork
+            if self.options.with_ssl != "wolfssl":
+                raise ConanInvalidConfiguration("option with_ngtcp2=True requires with_ssl=wolfssl")
+            if not self.dependencies["ngtcp2"].options.with_wolfssl:
+                raise ConanInvalidConfiguration("option with_ngtcp2=True requires ngtcp2:with_wolfssl=True")
 
     def build_requirements(self):
         if self._is_using_cmake_build:
@@ -458,6 +476,14 @@ class LibcurlConan(ConanFile):
         else:
             tc.configure_args.append("--without-nghttp2")
 
+        if self.options.get_safe("with_ngtcp2"):
+            path = unix_path(self, self.dependencies["ngtcp2"].package_folder)
+            tc.configure_args.append(f"--with-ngtcp2={path}")
+            path = unix_path(self, self.dependencies["nghttp3"].package_folder)
+            tc.configure_args.append(f"--with-nghttp3={path}")
+        else:
+            tc.configure_args.extend(["--without-ngtcp2", "--without-nghttp3"])
+
         if self.options.with_zlib:
             path = unix_path(self, self.dependencies["zlib"].package_folder)
             tc.configure_args.append(f"--with-zlib={path}")
@@ -580,6 +606,7 @@ class LibcurlConan(ConanFile):
         else:
             tc.variables["CMAKE_USE_WOLFSSL"] = self.options.with_ssl == "wolfssl"
         tc.variables["USE_NGHTTP2"] = self.options.with_nghttp2
+        tc.variables["USE_NGTCP2"] = self.options.get_safe("with_ngtcp2", False)
         tc.variables["CURL_ZLIB"] = self.options.with_zlib
         tc.variables["CURL_BROTLI"] = self.options.with_brotli
         tc.variables["CURL_ZSTD"] = self.options.with_zstd
@@ -695,6 +722,9 @@ class LibcurlConan(ConanFile):
             self.cpp_info.components["curl"].requires.append("wolfssl::wolfssl")
         if self.options.with_nghttp2:
             self.cpp_info.components["curl"].requires.append("libnghttp2::libnghttp2")
+        if self.options.get_safe("with_ngtcp2"):
+            self.cpp_info.components["curl"].requires.extend(
+                ["ngtcp2::libngtcp2", "ngtcp2::crypto_wolfssl", "nghttp3::nghttp3"])
         if self.options.with_libssh2:
             self.cpp_info.components["curl"].requires.append("libssh2::libssh2")
         if self.options.with_zlib:
@@ -0,0 +1,9 @@
+#include <stdio.h>
+
+#include <nghttp3/nghttp3.h>
+
+int main(void) {
+    const nghttp3_info *info = nghttp3_version(0);
+    printf("nghttp3 version: %s\n", info->version_str);
+    return 0;
+}
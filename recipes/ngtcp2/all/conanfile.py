@@ -0,0 +1,98 @@
+from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
+from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
+from conan.tools.files import copy, get, rmdir
+import os
+
+required_conan_version = ">=1.53.0"
+
+
+class Ngtcp2Conan(ConanFile):
+    name = "ngtcp2"
+    description = "ngtcp2 project is an effort to implement RFC9000 QUIC protocol"
+    license = "MIT"
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "https://github.com/ngtcp2/ngtcp2"
+    topics = ("quic", "http3", "protocol", "network")
+    package_type = "library"
+    settings = "os", "arch", "compiler", "build_type"
+    options = {
+        "shared": [True, False],
+        "fPIC": [True, False],
+        "with_wolfssl": [True, False],
+    }
+    default_options = {
+        "shared": False,
+        "fPIC": True,
+        "with_wolfssl": True,
+    }
+
+    def config_options(self):
+        if self.settings.os == "Windows":
+            del self.options.fPIC
+
+    def configure(self):
+        if self.options.shared:
+            self.options.rm_safe("fPIC")
+        self.settings.rm_safe("compiler.cppstd")
+        self.settings.rm_safe("compiler.libcxx")
+        if self.options.with_wolfssl:
+            # ngtcp2_crypto_wolfssl relies on the QUIC API of wolfSSL
+            self.options["wolfssl"].quic = True
+            self.options["wolfssl"].tls13 = True
+
+    def layout(self):
+        cmake_layout(self, src_folder="src")
+
+    def requirements(self):
+        if self.options.with_wolfssl:
+            self.requires("wolfssl/5.5.1")
+
+    def validate(self):
+        if self.options.with_wolfssl and not self.dependencies["wolfssl"].options.get_safe("quic"):
+            raise ConanInvalidConfiguration(f"{self.ref} option with_wolfssl=True requires wolfssl:quic=True")
+
+    def source(self):
+        get(self, **self.conan_data["sources"][self.version], strip_root=True)
+
+    def generate(self):
+        tc = CMakeToolchain(self)
+        tc.variables["ENABLE_SHARED_LIB"] = self.options.shared
+        tc.variables["ENABLE_STATIC_LIB"] = not self.options.shared
+        tc.variables["ENABLE_LIB_ONLY"] = True
+        # The QUIC API needed by the OpenSSL backend is only provided by the quictls fork
+        tc.variables["ENABLE_OPENSSL"] = False
+        tc.variables["ENABLE_GNUTLS"] = False
+        tc.variables["ENABLE_BORINGSSL"] = False
+        tc.variables["ENABLE_PICOTLS"] = False
+        tc.variables["ENABLE_WOLFSSL"] = self.options.with_wolfssl
+        tc.generate()
+        deps = CMakeDeps(self)
+        deps.generate()
+
+    def build(self):
+        cmake = CMake(self)
+        cmake.configure()
+        cmake.build()
+
+    def package(self):
+        copy(self, "COPYING", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
+        cmake = CMake(self)
+        cmake.install()
+        rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
+        rmdir(self, os.path.join(self.package_folder, "share"))
+
+    def package_info(self):
+        self.cpp_info.set_property("cmake_file_name", "ngtcp2")
+
+        self.cpp_info.components["libngtcp2"].set_property("cmake_target_name", "ngtcp2::ngtcp2")
+        self.cpp_info.components["libngtcp2"].set_property("pkg_config_name", "libngtcp2")
+        self.cpp_info.components["libngtcp2"].libs = ["ngtcp2"]
+        if self.settings.os == "Windows" and not self.options.shared:
+            self.cpp_info.components["libngtcp2"].defines.append("NGTCP2_STATICLIB")
+
+        if self.options.with_wolfssl:
+            self.cpp_info.components["crypto_wolfssl"].set_property("cmake_target_name", "ngtcp2::ngtcp2_crypto_wolfssl")
+            self.cpp_info.components["crypto_wolfssl"].set_property("pkg_config_name", "libngtcp2_crypto_wolfssl")
+            self.cpp_info.components["crypto_wolfssl"].libs = ["ngtcp2_crypto_wolfssl"]
+            self.cpp_info.components["crypto_wolfssl"].requires = ["libngtcp2", "wolfssl::wolfssl"]
@@ -0,0 +1,9 @@
+#include <stdio.h>
+
+#include <ngtcp2/ngtcp2.h>
+
+int main(void) {
+    const ngtcp2_info *info = ngtcp2_version(0);
+    printf("ngtcp2 version: %s\n", info->version_str);
+    return 0;
+}
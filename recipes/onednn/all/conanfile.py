@@ -0,0 +1,105 @@
+from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
+from conan.tools.apple import is_apple_os
+from conan.tools.build import check_min_cppstd
+from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
+from conan.tools.files import copy, get, rmdir
+import os
+
+required_conan_version = ">=1.53.0"
+
+
+class OneDNNConan(ConanFile):
+    name = "onednn"
+    description = "oneAPI Deep Neural Network Library (oneDNN), a performance library of basic building blocks for deep learning applications"
+    license = "Apache-2.0"
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "https://github.com/oneapi-src/oneDNN"
+    topics = ("deep-learning", "neural-network", "dnnl", "mkl-dnn", "cpu")
+    package_type = "library"
+    settings = "os", "arch", "compiler", "build_type"
+    options = {
+        "shared": [True, False],
+        "fPIC": [True, False],
+        "cpu_runtime": ["omp", "tbb", "seq"],
+    }
+    default_options = {
+        "shared": False,
+        "fPIC": True,
+        "cpu_runtime": "omp",
+    }
+
+    def config_options(self):
+        if self.settings.os == "Windows":
+            del self.options.fPIC
+        if is_apple_os(self):
+            # apple-clang has no OpenMP runtime
+            self.options.cpu_runtime = "seq"
+
+    def configure(self):
+        if self.options.shared:
+            self.options.rm_safe("fPIC")
+
+    def layout(self):
+        cmake_layout(self, src_folder="src")
+
+    def requirements(self):
+        if self.options.cpu_runtime == "tbb":
+            self.requires("onetbb/2021.8.0")
+        elif self.options.cpu_runtime == "omp" and self.settings.compiler == "clang":
+            self.requires("llvm-openmp/12.0.1")
+
+    def validate(self):
+        if self.settings.compiler.get_safe("cppstd"):
+            check_min_cppstd(self, 11)
+        if str(self.settings.arch) not in ("x86_64", "armv8", "ppc64le", "s390x"):
+            raise ConanInvalidConfiguration(f"{self.ref} only supports 64-bit architectures")
+        if self.options.cpu_runtime == "omp" and self.settings.compiler == "apple-clang":
+            raise ConanInvalidConfiguration(f"{self.ref} option cpu_runtime=omp is not supported by apple-clang")
+
+    def source(self):
+        get(self, **self.conan_data["sources"][self.version], strip_root=True)
+
+    def generate(self):
+        tc = CMakeToolchain(self)
+        tc.variables["DNNL_LIBRARY_TYPE"] = "SHARED" if self.options.shared else "STATIC"
+        tc.variables["DNNL_CPU_RUNTIME"] = str(self.options.cpu_runtime).upper()
+        tc.variables["DNNL_GPU_RUNTIME"] = "NONE"
+        tc.variables["DNNL_BUILD_EXAMPLES"] = False
+        tc.variables["DNNL_BUILD_TESTS"] = False
+        # Several primitives may be executed concurrently by the consumers, e.g. onnxruntime sessions
+        tc.variables["DNNL_ENABLE_CONCURRENT_EXEC"] = True
+        tc.generate()
+        deps = CMakeDeps(self)
+        deps.generate()
+
+    def build(self):
+        cmake = CMake(self)
+        cmake.configure()
+        cmake.build()
+
+    def package(self):
+        copy(self, "LICENSE", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
+        cmake = CMake(self)
+        cmake.install()
+        rmdir(self, os.path.join(self.package_folder, "lib", "cmake"))
+        rmdir(self, os.path.join(self.package_folder, "share"))
+
+    def package_info(self):
+        self.cpp_info.set_property("cmake_file_name", "dnnl")
+        self.cpp_info.set_property("cmake_target_name", "DNNL::dnnl")
+        self.cpp_info.libs = ["dnnl"]
+        if self.settings.os in ["Linux", "FreeBSD"]:
+            self.cpp_info.system_libs.extend(["dl", "m", "pthread"])
+
+        if not self.options.shared and self.options.cpu_runtime == "omp" and self.settings.compiler == "gcc":
+            # libgomp must be linked by the consumers of the static library. The objects built by msvc
+            # already reference vcomp, and clang links the llvm-openmp package.
+            self.cpp_info.exelinkflags.append("-fopenmp")
+            self.cpp_info.sharedlinkflags.append("-fopenmp")
+
+        # TODO: to remove in conan v2 once cmake_find_package* generators removed
+        self.cpp_info.names["cmake_find_package"] = "DNNL"
+        self.cpp_info.names["cmake_find_package_multi"] = "DNNL"
+        self.cpp_info.filenames["cmake_find_package"] = "dnnl"
+        self.cpp_info.filenames["cmake_find_package_multi"] = "dnnl"
@@ -0,0 +1,15 @@
+#include <oneapi/dnnl/dnnl.hpp>
+
+#include <iostream>
+
+int main() {
+    const dnnl_version_t *version = dnnl_version();
+    std::cout << "oneDNN " << version->major << "." << version->minor << "." << version->patch
+              << " (cpu runtime: " << version->cpu_runtime << ")" << std::endl;
+
+    dnnl::engine engine(dnnl::engine::kind::cpu, 0);
+    dnnl::stream stream(engine);
+    stream.wait();
+
+    return 0;
+}
@@ -2,7 +2,7 @@ from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
-from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rmdir
+from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, load, rmdir, save
 from conan.tools.build import check_min_cppstd
 from conan.tools.scm import Version
 from conan.tools.env import VirtualBuildEnv
@@ -26,11 +26,15 @@ class OnnxRuntimeConan(ConanFile):
         "shared": [True, False],
         "fPIC": [True, False],
         "with_xnnpack": [True, False],
+        "with_dnnl": [True, False],
+        "with_mimalloc": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "with_xnnpack": False,
+        "with_dnnl": False,
+        "with_mimalloc": False,
     }
     short_paths = True
 
@@ -50,6 +54,7 @@ class OnnxRuntimeConan(ConanFile):
 
     def export_sources(self):
         export_conandata_patches(self)
+        copy(self, "onnxruntime_*.cmake", self.recipe_folder, os.path.join(self.export_sources_folder, "src"))
 
     def config_options(self):
         if self.settings.os == "Windows":
@@ -81,6 +86,11 @@ class OnnxRuntimeConan(ConanFile):
             self.requires("wil/1.0.230202.1")
         if self.options.with_xnnpack:
             self.requires("xnnpack/cci.20220801")
+        if self.options.with_dnnl:
+            # onnxruntime 1.14 DNNL execution provider is written against the oneDNN 2.x API
+            self.requires("onednn/2.7.1")
+        if self.options.with_mimalloc:
+            self.requires("mimalloc/2.0.9")
 
     def validate(self):
         if self.settings.compiler.get_safe("cppstd"):
@@ -90,6 +100,10 @@ class OnnxRuntimeConan(ConanFile):
             raise ConanInvalidConfiguration(
                 f"{self.ref} requires C++{self._min_cppstd}, which your compiler does not support."
             )
+        if self.options.with_dnnl and not self.options.shared:
+            # onnxruntime_providers_dnnl is a module loaded at runtime through onnxruntime_providers_shared,
+            # the static libraries of onnxruntime can't load it
+            raise ConanInvalidConfiguration(f"{self.ref} option with_dnnl=True requires shared=True")
 
     def build_requirements(self):
         # Required by upstream https://github.com/microsoft/onnxruntime/blob/v1.14.1/cmake/CMakeLists.txt#L5
@@ -102,6 +116,7 @@ class OnnxRuntimeConan(ConanFile):
         tc = CMakeToolchain(self)
         # disable downloading dependencies to ensure conan ones are used
         tc.variables["FETCHCONTENT_FULLY_DISCONNECTED"] = True
+        tc.cache_variables["CMAKE_PROJECT_onnxruntime_INCLUDE"] = os.path.join(self.source_folder, "onnxruntime_project_include.cmake")
 
         tc.variables["onnxruntime_BUILD_SHARED_LIB"] = self.options.shared
         tc.variables["onnxruntime_USE_FULL_PROTOBUF"] = not self.dependencies["protobuf"].options.lite
@@ -110,14 +125,16 @@ class OnnxRuntimeConan(ConanFile):
         tc.variables["onnxruntime_BUILD_UNIT_TESTS"] = False
         tc.variables["onnxruntime_RUN_ONNX_TESTS"] = False
         tc.variables["onnxruntime_GENERATE_TEST_REPORTS"] = False
+        # mimalloc is injected by onnxruntime_project_include.cmake
         tc.variables["onnxruntime_USE_MIMALLOC"] = False
+        tc.variables["CONAN_ONNXRUNTIME_WITH_MIMALLOC"] = self.options.with_mimalloc
         tc.variables["onnxruntime_ENABLE_PYTHON"] = False
         tc.variables["onnxruntime_BUILD_CSHARP"] = False
         tc.variables["onnxruntime_BUILD_JAVA"] = False
         tc.variables["onnxruntime_BUILD_NODEJS"] = False
         tc.variables["onnxruntime_BUILD_OBJC"] = False
         tc.variables["onnxruntime_BUILD_APPLE_FRAMEWORK"] = False
-        tc.variables["onnxruntime_USE_DNNL"] = False
+        tc.variables["onnxruntime_USE_DNNL"] = self.options.with_dnnl
         tc.variables["onnxruntime_USE_NNAPI_BUILTIN"] = False
         tc.variables["onnxruntime_USE_RKNPU"] = False
         tc.variables["onnxruntime_USE_LLVM"] = False
@@ -185,8 +202,14 @@ class OnnxRuntimeConan(ConanFile):
         vbe = VirtualBuildEnv(self)
         vbe.generate(scope="build")
 
-    def build(self):
+    def _patch_sources(self):
         apply_conandata_patches(self)
+        if self.options.with_dnnl:
+            save(self, os.path.join(self.source_folder, "cmake", "external", "dnnl.cmake"),
+                 load(self, os.path.join(self.source_folder, "onnxruntime_dnnl.cmake")))
+
+    def build(self):
+        self._patch_sources()
         cmake = CMake(self)
         # https://github.com/microsoft/onnxruntime/blob/v1.14.1/cmake/CMakeLists.txt#L792
         # onnxruntime is builds its targets with COMPILE_WARNING_AS_ERROR ON
@@ -204,6 +227,8 @@ class OnnxRuntimeConan(ConanFile):
 
     def package_info(self):
         if self.options.shared:
+            # onnxruntime_providers_shared and onnxruntime_providers_dnnl (with_dnnl) are installed next to
+            # onnxruntime and loaded at runtime, consumers must not link them
             self.cpp_info.libs = ["onnxruntime"]
         else:
             onnxruntime_libs = [
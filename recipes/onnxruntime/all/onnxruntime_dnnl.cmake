@@ -0,0 +1,13 @@
+# Replaces cmake/external/dnnl.cmake, which downloads and builds oneDNN with ExternalProject:
+# the variables and targets expected by onnxruntime_providers.cmake are provided by the onednn package of conan
+find_package(dnnl REQUIRED CONFIG)
+
+if(NOT TARGET dnnl)
+    add_library(dnnl ALIAS DNNL::dnnl)
+endif()
+add_custom_target(project_dnnl)
+
+set(DNNL_INCLUDE_DIR "")
+set(DNNL_LIB_DIR "")
+set(DNNL_DLL_PATH "")
+set(DNNL_OCL_INCLUDE_DIR "")
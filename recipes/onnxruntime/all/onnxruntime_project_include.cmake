@@ -0,0 +1,11 @@
+if(CONAN_ONNXRUNTIME_WITH_MIMALLOC)
+    # The CPU allocator of onnxruntime calls mi_malloc_aligned/mi_free when USE_MIMALLOC is defined.
+    # Use the mimalloc of conan instead of the one fetched by onnxruntime_USE_MIMALLOC.
+    find_package(mimalloc REQUIRED CONFIG)
+    add_compile_definitions(USE_MIMALLOC)
+    if(TARGET mimalloc-static)
+        link_libraries(mimalloc-static)
+    else()
+        link_libraries(mimalloc)
+    endif()
+endif()
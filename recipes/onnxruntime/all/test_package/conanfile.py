@@ -1,13 +1,13 @@
 from conan import ConanFile
 from conan.tools.build import can_run
-from conan.tools.cmake import cmake_layout, CMake
+from conan.tools.cmake import cmake_layout, CMake, CMakeToolchain
 import os
 
 
 # It will become the standard on Conan 2.x
 class TestPackageConan(ConanFile):
     settings = "os", "arch", "compiler", "build_type"
-    generators = "CMakeDeps", "CMakeToolchain", "VirtualRunEnv"
+    generators = "CMakeDeps", "VirtualRunEnv"
     test_type = "explicit"
 
     def requirements(self):
@@ -16,6 +16,11 @@ class TestPackageConan(ConanFile):
     def layout(self):
         cmake_layout(self, src_folder=".")
 
+    def generate(self):
+        tc = CMakeToolchain(self)
+        tc.variables["WITH_DNNL"] = self.dependencies["onnxruntime"].options.with_dnnl
+        tc.generate()
+
     def build(self):
         cmake = CMake(self)
         cmake.configure()
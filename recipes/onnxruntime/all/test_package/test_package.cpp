@@ -1,9 +1,30 @@
-
 #include <onnxruntime_cxx_api.h>
+
+#include <algorithm>
 #include <iostream>
 
+#ifdef WITH_DNNL
+// declared by core/providers/dnnl/dnnl_provider_factory.h, which is not installed
+extern "C" {
+ORT_API_STATUS(OrtSessionOptionsAppendExecutionProvider_Dnnl, _In_ OrtSessionOptions* options, int use_arena);
+}
+#endif
+
 int main() {
   const auto& api = Ort::GetApi();
   std::cout << OrtGetApiBase()->GetVersionString() << std::endl;
+
+#ifdef WITH_DNNL
+  const auto providers = Ort::GetAvailableProviders();
+  if (std::find(providers.begin(), providers.end(), "DnnlExecutionProvider") == providers.end()) {
+    std::cerr << "DnnlExecutionProvider is not available" << std::endl;
+    return 1;
+  }
+  // loads onnxruntime_providers_dnnl
+  Ort::Env env;
+  Ort::SessionOptions session_options;
+  Ort::ThrowOnError(OrtSessionOptionsAppendExecutionProvider_Dnnl(session_options, 1));
+  std::cout << "DnnlExecutionProvider registered" << std::endl;
+#endif
   return 0;
 }
@@ -10,6 +10,7 @@ class TestPackageV1Conan(ConanFile):
 
     def build(self):
         cmake = CMake(self)
+        cmake.definitions["WITH_DNNL"] = self.options["onnxruntime"].with_dnnl
         cmake.configure()
         cmake.build()
 
@@ -3,7 +3,7 @@ from conans.errors import ConanInvalidConfiguration
 import os
 import functools
 
-required_conan_version = ">=1.43.0"
+required_conan_version = ">=1.53.0"
 
 
 class OpenblasConan(ConanFile):
@@ -19,14 +19,23 @@ class OpenblasConan(ConanFile):
         "fPIC": [True, False],
         "build_lapack": [True, False],
         "use_thread": [True, False],
+        "use_openmp": [True, False],
+        "num_threads": ["ANY"],
+        "target": [None, "ANY"],
         "dynamic_arch": [True, False],
+        "dynamic_list": [None, "ANY"],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "build_lapack": False,
         "use_thread": True,
+        "use_openmp": False,
+        # Maximum number of threads, OpenBLAS would otherwise use the number of cores of the build machine
+        "num_threads": "128",
+        "target": None,
         "dynamic_arch": False,
+        "dynamic_list": None,
     }
     generators = "cmake"
     short_paths = True
@@ -39,6 +48,14 @@ class OpenblasConan(ConanFile):
     def _build_subfolder(self):
         return "build_subfolder"
 
+    @property
+    def _is_msvc(self):
+        return str(self.settings.compiler) in ["Visual Studio", "msvc"]
+
+    @property
+    def _target_by_x86_64_level(self):
+        return {"x86-64": None, "x86-64-v2": "NEHALEM", "x86-64-v3": "HASWELL", "x86-64-v4": "SKYLAKEX"}
+
     def export_sources(self):
         self.copy("CMakeLists.txt")
 
@@ -49,10 +66,34 @@ class OpenblasConan(ConanFile):
     def configure(self):
         if self.options.shared:
             del self.options.fPIC
+        if not self.options.use_thread:
+            del self.options.use_openmp
+            del self.options.num_threads
+        if not self.options.dynamic_arch:
+            del self.options.dynamic_list
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._target_by_x86_64_level and \
+           str(self.options.target) == str(self.default_options["target"]):
+            self.options.target = self._target_by_x86_64_level[x86_64_level]
+
+    def requirements(self):
+        if self.options.get_safe("use_openmp") and self.settings.compiler in ("clang", "apple-clang"):
+            self.requires("llvm-openmp/12.0.1")
 
     def validate(self):
         if hasattr(self, "settings_build") and tools.cross_building(self, skip_x64_x86=True):
             raise ConanInvalidConfiguration("Cross-building not implemented")
+        if self.options.get_safe("use_openmp") and self._is_msvc:
+            raise ConanInvalidConfiguration(f"{self.ref} can not use OpenMP with Visual Studio")
+        num_threads = str(self.options.get_safe("num_threads", "1"))
+        if not num_threads.isdigit() or int(num_threads) < 1:
+            raise ConanInvalidConfiguration(f"{self.ref}: num_threads must be a positive number, not '{num_threads}'")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and \
+           str(self.options.target) != str(self._target_by_x86_64_level.get(x86_64_level, "")):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: target={self.options.target} does not match user.cci:x86_64_level={x86_64_level}"
+            )
 
     def source(self):
         tools.get(
@@ -70,7 +111,15 @@ class OpenblasConan(ConanFile):
         cmake.definitions["NOFORTRAN"] = not self.options.build_lapack
         cmake.definitions["BUILD_WITHOUT_LAPACK"] = not self.options.build_lapack
         cmake.definitions["DYNAMIC_ARCH"] = self.options.dynamic_arch
+        if self.options.get_safe("dynamic_list"):
+            # Only build the kernels of these targets in the DYNAMIC_ARCH library
+            cmake.definitions["DYNAMIC_LIST"] = ";".join(str(self.options.dynamic_list).upper().replace(",", " ").split())
+        if self.options.target:
+            cmake.definitions["TARGET"] = str(self.options.target).upper()
         cmake.definitions["USE_THREAD"] = self.options.use_thread
+        cmake.definitions["USE_OPENMP"] = self.options.get_safe("use_openmp", False)
+        if self.options.use_thread:
+            cmake.definitions["NUM_THREADS"] = self.options.num_threads
 
         # Required for safe concurrent calls to OpenBLAS routines
         cmake.definitions["USE_LOCKING"] = not self.options.use_thread
@@ -123,11 +172,13 @@ endif()"""
         # CMake config file:
         # - OpenBLAS always has one and only one of these components: openmp, pthread or serial.
         # - Whatever if this component is requested or not, official CMake imported target is always OpenBLAS::OpenBLAS
-        # - TODO: add openmp component when implemented in this recipe
         self.cpp_info.set_property("cmake_file_name", "OpenBLAS")
         self.cpp_info.set_property("cmake_target_name", "OpenBLAS::OpenBLAS")
         self.cpp_info.set_property("pkg_config_name", "openblas")
-        cmake_component_name = "pthread" if self.options.use_thread else "serial" # TODO: ow to model this in CMakeDeps?
+        if self.options.get_safe("use_openmp"):
+            cmake_component_name = "openmp"
+        else:
+            cmake_component_name = "pthread" if self.options.use_thread else "serial" # TODO: ow to model this in CMakeDeps?
         self.cpp_info.components["openblas_component"].set_property("pkg_config_name", "openblas")
         self.cpp_info.components["openblas_component"].includedirs.append(
             os.path.join("include", "openblas")
@@ -139,6 +190,11 @@ endif()"""
                 self.cpp_info.components["openblas_component"].system_libs.append("pthread")
             if self.options.build_lapack:
                 self.cpp_info.components["openblas_component"].system_libs.append("gfortran")
+        if self.options.get_safe("use_openmp"):
+            if self.settings.compiler == "gcc":
+                self.cpp_info.components["openblas_component"].system_libs.append("gomp")
+            elif self.settings.compiler in ("clang", "apple-clang"):
+                self.cpp_info.components["openblas_component"].requires.append("llvm-openmp::llvm-openmp")
 
         self.output.info(
             "Setting OpenBLAS_HOME environment variable: {}".format(self.package_folder)
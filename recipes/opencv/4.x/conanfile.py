@@ -121,6 +121,12 @@ class OpenCVConan(ConanFile):
     def _protobuf_version(self):
         return "3.17.1"
 
+    @property
+    def _cpu_baseline_by_x86_64_level(self):
+        # Higher levels are still dispatched at runtime, see cpu_dispatch
+        return {"x86-64": "SSE2", "x86-64-v2": "SSE4_2,POPCNT", "x86-64-v3": "AVX2,FMA3,FP16",
+                "x86-64-v4": "AVX512_SKX"}
+
     def export_sources(self):
         export_conandata_patches(self)
 
@@ -172,6 +178,11 @@ class OpenCVConan(ConanFile):
         if self.settings.os == "Android":
             self.options.with_openexr = False  # disabled because this forces linkage to libc++_shared.so
 
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._cpu_baseline_by_x86_64_level and \
+           str(self.options.cpu_baseline) == str(self.default_options["cpu_baseline"]):
+            self.options.cpu_baseline = self._cpu_baseline_by_x86_64_level[x86_64_level]
+
     def layout(self):
         cmake_layout(self, src_folder="src")
 
@@ -228,6 +239,12 @@ class OpenCVConan(ConanFile):
             raise ConanInvalidConfiguration("Visual Studio with static runtime is not supported for shared library.")
         if self.settings.compiler == "clang" and Version(self.settings.compiler.version) < "4":
             raise ConanInvalidConfiguration("Clang 3.x can't build OpenCV 4.x due to an internal bug.")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and \
+           str(self.options.cpu_baseline) != self._cpu_baseline_by_x86_64_level.get(x86_64_level):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: cpu_baseline={self.options.cpu_baseline} does not match user.cci:x86_64_level={x86_64_level}"
+            )
         if self.options.with_cuda and not self.options.contrib:
             raise ConanInvalidConfiguration("contrib must be enabled for cuda")
         if self.options.get_safe("dnn_cuda") and \
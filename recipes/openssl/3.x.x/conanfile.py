@@ -1,14 +1,15 @@
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import fix_apple_shared_install_name, is_apple_os, XCRun
 from conan.tools.build import build_jobs
-from conan.tools.files import chdir, copy, get, rename, replace_in_file, rmdir, save
+from conan.tools.files import chdir, copy, get, load, rename, replace_in_file, rmdir, save
 from conan.tools.gnu import AutotoolsToolchain
 from conan.tools.layout import basic_layout
 from conan.tools.microsoft import is_msvc, msvc_runtime_flag, unix_path
 
 import fnmatch
 import os
+import re
 import textwrap
 
 required_conan_version = ">=1.57.0"
@@ -26,6 +27,7 @@ class OpenSSLConan(ConanFile):
         "shared": [True, False],
         "fPIC": [True, False],
         "enable_weak_ssl_ciphers": [True, False],
+        "enable_ktls": [True, False],
         "386": [True, False],
         "capieng_dialog": [True, False],
         "enable_capieng": [True, False],
@@ -99,6 +101,8 @@ class OpenSSLConan(ConanFile):
             self.options.rm_safe("enable_capieng")
         else:
             self.options.rm_safe("fPIC")
+        if self.settings.os != "Linux":
+            self.options.rm_safe("enable_ktls")
 
         if self.settings.os == "Emscripten":
             self.options.no_asm = True
@@ -133,6 +137,9 @@ class OpenSSLConan(ConanFile):
             
         if self.settings.os == "iOS" and self.options.shared:
             raise ConanInvalidConfiguration("OpenSSL 3 does not support building shared libraries for iOS")
+
+        if self.options.get_safe("enable_ktls") and self.options.no_sock:
+            raise ConanInvalidConfiguration("openssl:enable_ktls=True requires openssl:no_sock=False")
             
     def layout(self):
         basic_layout(self, src_folder="src")
@@ -505,6 +512,13 @@ class OpenSSLConan(ConanFile):
                 self._replace_runtime_in_file(os.path.join("Configurations", "10-main.conf"))
 
             self.run("{perl} ./Configure {args}".format(perl=self._perl, args=args), env="conanbuild")
+            if self.options.get_safe("enable_ktls"):
+                # Configure silently disables KTLS when the kernel headers don't provide linux/tls.h (Linux < 4.13)
+                disabled = re.search(r'"ktls"\s*=>\s*"([^"]+)"', load(self, "configdata.pm"))
+                if disabled:
+                    raise ConanException(
+                        f"openssl:enable_ktls=True but Configure disabled KTLS ({disabled.group(1)}), "
+                        "kernel headers >= 4.13 are required")
             if self._use_nmake:
                 # When `--prefix=/`, the scripts derive `\` without escaping, which
                 # causes issues on Windows
@@ -5,7 +5,7 @@ import os
 import glob
 import shutil
 
-required_conan_version = ">=1.43.0"
+required_conan_version = ">=1.53.0"
 
 
 class RocksDB(ConanFile):
@@ -28,6 +28,8 @@ class RocksDB(ConanFile):
         "with_zstd": [True, False],
         "with_tbb": [True, False],
         "with_jemalloc": [True, False],
+        "with_liburing": [True, False],
+        "use_folly_distributed_mutex": [True, False],
         "enable_sse": [False, "sse42", "avx2"],
         "use_rtti": [True, False],
     }
@@ -42,6 +44,8 @@ class RocksDB(ConanFile):
         "with_gflags": False,
         "with_tbb": False,
         "with_jemalloc": False,
+        "with_liburing": False,
+        "use_folly_distributed_mutex": False,
         "enable_sse": False,
         "use_rtti": False,
     }
@@ -61,6 +65,10 @@ class RocksDB(ConanFile):
     def _is_msvc(self):
         return str(self.settings.compiler) in ["Visual Studio", "msvc"]
 
+    @property
+    def _enable_sse_by_x86_64_level(self):
+        return {"x86-64": False, "x86-64-v2": "sse42", "x86-64-v3": "avx2", "x86-64-v4": "avx2"}
+
     def export_sources(self):
         self.copy("CMakeLists.txt")
         for patch in self.conan_data.get("patches", {}).get(self.version, []):
@@ -77,6 +85,10 @@ class RocksDB(ConanFile):
     def configure(self):
         if self.options.shared:
             del self.options.fPIC
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._enable_sse_by_x86_64_level and \
+           self.options.enable_sse == self.default_options["enable_sse"]:
+            self.options.enable_sse = self._enable_sse_by_x86_64_level[x86_64_level]
 
     def requirements(self):
         if self.options.with_gflags:
@@ -93,12 +105,28 @@ class RocksDB(ConanFile):
             self.requires("onetbb/2020.3")
         if self.options.with_jemalloc:
             self.requires("jemalloc/5.2.1")
+        if self.options.with_liburing:
+            self.requires("liburing/2.2")
 
     def validate(self):
         if self.settings.compiler.get_safe("cppstd"):
             tools.check_min_cppstd(self, 11)
         if self.settings.arch not in ["x86_64", "ppc64le", "ppc64", "mips64", "armv8"]:
             raise ConanInvalidConfiguration("Rocksdb requires 64 bits")
+        if self.options.with_liburing and self.settings.os != "Linux":
+            raise ConanInvalidConfiguration(f"{self.ref}: with_liburing is only supported on Linux")
+        if self.options.with_liburing and tools.Version(self.version) < "6.10.2":
+            raise ConanInvalidConfiguration(f"{self.ref}: with_liburing requires rocksdb >= 6.10.2")
+        if self.options.use_folly_distributed_mutex and self.settings.os != "Linux":
+            raise ConanInvalidConfiguration(f"{self.ref}: use_folly_distributed_mutex is only supported on Linux")
+        if self.options.use_folly_distributed_mutex and tools.Version(self.version) < "6.10.2":
+            raise ConanInvalidConfiguration(f"{self.ref}: use_folly_distributed_mutex requires rocksdb >= 6.10.2")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and \
+           str(self.options.enable_sse) != str(self._enable_sse_by_x86_64_level.get(x86_64_level)):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: enable_sse={self.options.enable_sse} does not match user.cci:x86_64_level={x86_64_level}"
+            )
 
         if self.settings.os == "Windows" and \
            self.settings.compiler == "Visual Studio" and \
@@ -136,7 +164,8 @@ class RocksDB(ConanFile):
         self._cmake.definitions["WITH_TOOLS"] = False
         self._cmake.definitions["WITH_CORE_TOOLS"] = False
         self._cmake.definitions["WITH_BENCHMARK_TOOLS"] = False
-        self._cmake.definitions["WITH_FOLLY_DISTRIBUTED_MUTEX"] = False
+        # DistributedMutex is compiled from the folly sources bundled in third-party/folly, not from the folly package
+        self._cmake.definitions["WITH_FOLLY_DISTRIBUTED_MUTEX"] = self.options.use_folly_distributed_mutex
         if self._is_msvc:
             self._cmake.definitions["WITH_MD_LIBRARY"] = "MD" in msvc_runtime_flag(self)
         self._cmake.definitions["ROCKSDB_INSTALL_ON_WINDOWS"] = self.settings.os == "Windows"
@@ -148,6 +177,8 @@ class RocksDB(ConanFile):
         self._cmake.definitions["WITH_ZSTD"] = self.options.with_zstd
         self._cmake.definitions["WITH_TBB"] = self.options.get_safe("with_tbb", False)
         self._cmake.definitions["WITH_JEMALLOC"] = self.options.with_jemalloc
+        # io_uring read path of MultiGet/MultiRead, found with RocksDB's own Finduring.cmake
+        self._cmake.definitions["WITH_LIBURING"] = self.options.with_liburing
         self._cmake.definitions["ROCKSDB_BUILD_SHARED"] = self.options.shared
         self._cmake.definitions["ROCKSDB_LIBRARY_EXPORTS"] = self.settings.os == "Windows" and self.options.shared
         self._cmake.definitions["ROCKSDB_DLL" ] = self.settings.os == "Windows" and self.options.shared
@@ -239,3 +270,5 @@ class RocksDB(ConanFile):
             self.cpp_info.components["librocksdb"].requires.append("onetbb::onetbb")
         if self.options.with_jemalloc:
             self.cpp_info.components["librocksdb"].requires.append("jemalloc::jemalloc")
+        if self.options.with_liburing:
+            self.cpp_info.components["librocksdb"].requires.append("liburing::liburing")
@@ -1,4 +1,5 @@
 from conan import ConanFile
+from conan.errors import ConanInvalidConfiguration
 from conan.tools.build import check_min_cppstd, stdcpp_library
 from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
 from conan.tools.files import apply_conandata_patches, copy, export_conandata_patches, get, rmdir
@@ -21,22 +22,34 @@ class SnappyConan(ConanFile):
     options = {
         "shared": [True, False],
         "fPIC": [True, False],
+        "simd": [False, "avx", "avx2"],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
+        "simd": False,
     }
 
+    @property
+    def _simd_by_x86_64_level(self):
+        return {"x86-64": False, "x86-64-v2": False, "x86-64-v3": "avx2", "x86-64-v4": "avx2"}
+
     def export_sources(self):
         export_conandata_patches(self)
 
     def config_options(self):
         if self.settings.os == 'Windows':
             del self.options.fPIC
+        if self.settings.arch not in ["x86", "x86_64"] or Version(self.version) < "1.1.8":
+            del self.options.simd
 
     def configure(self):
         if self.options.shared:
             self.options.rm_safe("fPIC")
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level in self._simd_by_x86_64_level and \
+           self.options.get_safe("simd") == self.default_options["simd"]:
+            self.options.simd = self._simd_by_x86_64_level[x86_64_level]
 
     def layout(self):
         cmake_layout(self, src_folder="src")
@@ -44,6 +57,12 @@ class SnappyConan(ConanFile):
     def validate(self):
         if self.settings.compiler.get_safe("cppstd"):
             check_min_cppstd(self, 11)
+        x86_64_level = self.conf.get("user.cci:x86_64_level", check_type=str)
+        if self.settings.arch == "x86_64" and x86_64_level and "simd" in self.options and \
+           str(self.options.simd) != str(self._simd_by_x86_64_level.get(x86_64_level)):
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: simd={self.options.simd} does not match user.cci:x86_64_level={x86_64_level}"
+            )
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
@@ -53,10 +72,12 @@ class SnappyConan(ConanFile):
         tc.variables["SNAPPY_BUILD_TESTS"] = False
         if Version(self.version) >= "1.1.8":
             tc.variables["SNAPPY_FUZZING_BUILD"] = False
-            # Don't use these avx options. These are useless.
+            # Off by default, the binaries would require these instructions on the host.
             # https://github.com/conan-io/conan-center-index/pull/16495
-            tc.variables["SNAPPY_REQUIRE_AVX"] = False
-            tc.variables["SNAPPY_REQUIRE_AVX2"] = False
+            # With avx2, snappy also uses BMI2 in its decompression fast path.
+            simd = self.options.get_safe("simd", False)
+            tc.variables["SNAPPY_REQUIRE_AVX"] = simd in ("avx", "avx2")
+            tc.variables["SNAPPY_REQUIRE_AVX2"] = simd == "avx2"
             tc.variables["SNAPPY_INSTALL"] = True
         if Version(self.version) >= "1.1.9":
             tc.variables["SNAPPY_BUILD_BENCHMARKS"] = False
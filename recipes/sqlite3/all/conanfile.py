@@ -47,6 +47,14 @@ class Sqlite3Conan(ConanFile):
         "build_executable": [True, False],
         "enable_default_vfs": [True, False],
         "enable_dbpage_vtab": [True, False],
+        "default_memstatus": [True, False],
+        "default_cache_size": [None, "ANY"],
+        "default_page_size": [None, "ANY"],
+        "default_mmap_size": [None, "ANY"],
+        "max_mmap_size": [None, "ANY"],
+        "default_wal_synchronous": [None, 0, 1, 2, 3],
+        "like_doesnt_match_blobs": [True, False],
+        "omit_shared_cache": [True, False],
     }
     default_options = {
         "shared": False,
@@ -76,6 +84,14 @@ class Sqlite3Conan(ConanFile):
         "build_executable": True,
         "enable_default_vfs": True,
         "enable_dbpage_vtab": False,
+        "default_memstatus": True,
+        "default_cache_size": None,       # Uses default value from source
+        "default_page_size": None,        # Uses default value from source
+        "default_mmap_size": None,        # Uses default value from source
+        "max_mmap_size": None,            # Uses default value from source
+        "default_wal_synchronous": None,  # Uses default value from source
+        "like_doesnt_match_blobs": False,
+        "omit_shared_cache": False,
     }
 
     exports_sources = "CMakeLists.txt"
@@ -149,6 +165,21 @@ class Sqlite3Conan(ConanFile):
             tc.variables["MAX_BLOB_SIZE"] = self.options.max_blob_size
         tc.variables["DISABLE_DEFAULT_VFS"] = not self.options.enable_default_vfs
         tc.variables["ENABLE_DBPAGE_VTAB"] = self.options.enable_dbpage_vtab
+        # Performance related options: https://sqlite.org/compile.html#recommended_compile_time_options
+        tc.variables["DEFAULT_MEMSTATUS"] = self.options.default_memstatus
+        if self.options.default_cache_size:
+            tc.variables["DEFAULT_CACHE_SIZE"] = self.options.default_cache_size
+        if self.options.default_page_size:
+            tc.variables["DEFAULT_PAGE_SIZE"] = self.options.default_page_size
+        # 0 is a meaningful value of these ones (e.g. max_mmap_size=0 disables memory-mapped I/O)
+        if str(self.options.default_mmap_size) != "None":
+            tc.variables["DEFAULT_MMAP_SIZE"] = self.options.default_mmap_size
+        if str(self.options.max_mmap_size) != "None":
+            tc.variables["MAX_MMAP_SIZE"] = self.options.max_mmap_size
+        if str(self.options.default_wal_synchronous) != "None":
+            tc.variables["DEFAULT_WAL_SYNCHRONOUS"] = self.options.default_wal_synchronous
+        tc.variables["LIKE_DOESNT_MATCH_BLOBS"] = self.options.like_doesnt_match_blobs
+        tc.variables["OMIT_SHARED_CACHE"] = self.options.omit_shared_cache
         tc.generate()
 
     def build(self):
@@ -197,6 +228,9 @@ class Sqlite3Conan(ConanFile):
         self.cpp_info.components["sqlite"].libs = ["sqlite3"]
         if self.options.omit_load_extension:
             self.cpp_info.components["sqlite"].defines.append("SQLITE_OMIT_LOAD_EXTENSION")
+        if self.options.omit_shared_cache:
+            # sqlite3_enable_shared_cache() is not available
+            self.cpp_info.components["sqlite"].defines.append("SQLITE_OMIT_SHARED_CACHE")
         if self.settings.os in ["Linux", "FreeBSD"]:
             if self.options.threadsafe:
                 self.cpp_info.components["sqlite"].system_libs.append("pthread")
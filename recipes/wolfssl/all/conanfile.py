@@ -6,6 +6,7 @@ from conan.tools.files import copy, get, rename, rm, rmdir
 from conan.tools.gnu import Autotools, AutotoolsToolchain
 from conan.tools.layout import basic_layout
 from conan.tools.microsoft import check_min_vs, is_msvc, unix_path
+from conan.tools.scm import Version
 import os
 
 required_conan_version = ">=1.54.0"
@@ -38,6 +39,7 @@ class WolfSSLConan(ConanFile):
         "sessioncerts": [True, False],
         "sni": [True, False],
         "testcert": [True, False],
+        "quic": [True, False],
     }
     default_options = {
         "shared": False,
@@ -54,6 +56,7 @@ class WolfSSLConan(ConanFile):
         "sessioncerts": False,
         "sni": False,
         "testcert": False,
+        "quic": False,
     }
 
     @property
@@ -63,6 +66,8 @@ class WolfSSLConan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        if Version(self.version) < "5.5.0":
+            del self.options.quic
 
     def configure(self):
         if self.options.shared:
@@ -76,6 +81,8 @@ class WolfSSLConan(ConanFile):
     def validate(self):
         if self.options.opensslall and not self.options.opensslextra:
             raise ConanInvalidConfiguration("The option 'opensslall' requires 'opensslextra=True'")
+        if self.options.get_safe("quic") and not self.options.tls13:
+            raise ConanInvalidConfiguration("The option 'quic' requires 'tls13=True'")
 
     def build_requirements(self):
         self.tool_requires("libtool/2.4.7")
@@ -113,6 +120,9 @@ class WolfSSLConan(ConanFile):
             "--enable-shared={}".format(yes_no(self.options.shared)),
             "--enable-static={}".format(yes_no(not self.options.shared)),
         ])
+        if self.options.get_safe("quic"):
+            # session tickets and early data for QUIC 0-RTT
+            tc.configure_args.extend(["--enable-quic", "--enable-session-ticket", "--enable-earlydata"])
         if is_msvc(self):
             tc.extra_ldflags.append("-ladvapi32")
             if check_min_vs(self, "180", raise_invalid=False):
@@ -19,19 +19,24 @@ class XxHashConan(ConanFile):
         "shared": [True, False],
         "fPIC": [True, False],
         "utility": [True, False],
+        "dispatch": [True, False],
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "utility": True,
+        "dispatch": False,
     }
 
     def export_sources(self):
+        copy(self, "CMakeLists.txt", src=self.recipe_folder, dst=self.export_sources_folder)
         export_conandata_patches(self)
 
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        if self.settings.arch not in ["x86", "x86_64"]:
+            del self.options.dispatch
 
     def configure(self):
         if self.options.shared:
@@ -50,6 +55,7 @@ class XxHashConan(ConanFile):
         tc = CMakeToolchain(self)
         tc.variables["XXHASH_BUNDLED_MODE"] = False
         tc.variables["XXHASH_BUILD_XXHSUM"] = self.options.utility
+        tc.variables["XXHASH_X86DISPATCH"] = self.options.get_safe("dispatch", False)
         # Fix CMake configuration if target is iOS/tvOS/watchOS
         tc.cache_variables["CMAKE_MACOSX_BUNDLE"] = False
         # Generate a relocatable shared lib on Macos
@@ -59,7 +65,7 @@ class XxHashConan(ConanFile):
     def build(self):
         apply_conandata_patches(self)
         cmake = CMake(self)
-        cmake.configure(build_script_folder=os.path.join(self.source_folder, "cmake_unofficial"))
+        cmake.configure(build_script_folder=os.path.join(self.source_folder, os.pardir))
         cmake.build()
 
     def package(self):
@@ -84,5 +90,11 @@ class XxHashConan(ConanFile):
         self.cpp_info.components["libxxhash"].names["cmake_find_package"] = "xxhash"
         self.cpp_info.components["libxxhash"].names["cmake_find_package_multi"] = "xxhash"
         self.cpp_info.components["libxxhash"].set_property("cmake_target_name", "xxHash::xxhash")
+        if self.options.get_safe("dispatch"):
+            self.cpp_info.components["xxhash_x86dispatch"].set_property("cmake_target_name", "xxHash::xxhash_x86dispatch")
+            self.cpp_info.components["xxhash_x86dispatch"].libs = ["xxhash_x86dispatch"]
+            self.cpp_info.components["xxhash_x86dispatch"].requires = ["libxxhash"]
+            self.cpp_info.components["xxhash_x86dispatch"].names["cmake_find_package"] = "xxhash_x86dispatch"
+            self.cpp_info.components["xxhash_x86dispatch"].names["cmake_find_package_multi"] = "xxhash_x86dispatch"
         if self.options.utility:
             self.env_info.PATH.append(os.path.join(self.package_folder, "bin"))
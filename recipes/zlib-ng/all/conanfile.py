@@ -54,6 +54,13 @@ class ZlibNgConan(ConanFile):
     def validate(self):
         if self.info.options.zlib_compat and not self.info.options.with_gzfileop:
             raise ConanInvalidConfiguration("The option 'with_gzfileop' must be True when 'zlib_compat' is True.")
+        # The optimized code paths are selected at runtime, there is nothing to derive from user.cci:x86_64_level,
+        # but `-march=native` would build for the build machine instead of this level
+        if self.settings.arch == "x86_64" and self.conf.get("user.cci:x86_64_level", check_type=str) and \
+           self.info.options.with_native_instructions:
+            raise ConanInvalidConfiguration(
+                f"{self.ref}: with_native_instructions=True does not match the user.cci:x86_64_level conf"
+            )
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)